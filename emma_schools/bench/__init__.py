@@ -0,0 +1,22 @@
+"""Offline benchmarks with synthetic corpora and local stand-ins for network and model calls."""
+
+from .runner import (
+    DEFAULT_SCALES,
+    STAGES,
+    find_regressions,
+    previous_report,
+    run_benchmark,
+    save_report,
+)
+from .stand_ins import Latency, use_stand_ins
+
+__all__ = [
+    "DEFAULT_SCALES",
+    "STAGES",
+    "Latency",
+    "find_regressions",
+    "previous_report",
+    "run_benchmark",
+    "save_report",
+    "use_stand_ins",
+]
@@ -0,0 +1,110 @@
+"""Synthetic schools, raw files and evidence files for the offline benchmarks."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from pathlib import Path
+from typing import List, Sequence
+
+from emma_schools.config import School
+from emma_schools.core.paths import ensure_directories, evidence_file, scoring_grid
+from emma_schools.pipelines.raw_document import DimensionRun, RawDocument
+from emma_schools.pipelines.scoring import DIMENSION_HEADERS
+
+_POSITIVE = ["excellent", "strong results", "outstanding", "awards", "improving", "highly rated"]
+_NEGATIVE = ["concerns", "weaker", "declining", "issues", "warning"]
+_DOMAINS = ["gov.uk", "bbc.co.uk", "schoolsweek.co.uk", "mumsnet.com", "example-school.org.uk"]
+
+GRID_TEMPLATE = """# Scoring Grid
+
+| School | Academics | Arts | Facilities | Pastoral | Commute | Reputation | Fit | Overall |
+| --- | --- | --- | --- | --- | --- | --- | --- | --- |
+<!-- GRID:BEGIN -->
+<!-- GRID:END -->
+"""
+
+
+def synthetic_schools(count: int) -> List[School]:
+    width = len(str(count))
+    return [
+        School(
+            name=f"Synthetic School {index:0{width}d}",
+            slug=f"synthetic-school-{index:0{width}d}",
+            phase="secondary",
+        )
+        for index in range(count)
+    ]
+
+
+def _rng(*parts: str) -> random.Random:
+    seed = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def research_output(school_name: str, dimension: str, facts: int = 4) -> str:
+    """Deterministic Deep Research style output with ``facts`` Fact ID blocks."""
+
+    rng = _rng(school_name, dimension)
+    blocks = []
+    for index in range(facts):
+        domain = rng.choice(_DOMAINS)
+        words = rng.sample(_POSITIVE, 2) + rng.sample(_NEGATIVE, 1)
+        blocks.append(
+            f"### Fact ID: {dimension}-{index + 1}\n"
+            f"- Category: {dimension}\n"
+            f"- Tags: {dimension}, synthetic\n"
+            f"- Fact: {school_name} reports {', '.join(words)} in {dimension}.\n"
+            f'- Quote: "{words[0].capitalize()} across the board."\n'
+            f"- Source: {domain} report (https://{domain}/{dimension}/{rng.randrange(10_000)}) "
+            f"— Accessed: 2026-01-01 — Reliability: {rng.randint(1, 3)}\n"
+        )
+    return "\n".join(blocks)
+
+
+def evidence_output(school_name: str) -> str:
+    """Deterministic evidence Markdown with one scored section per dimension."""
+
+    rng = _rng(school_name, "evidence")
+    sections = [f"# {school_name} — Evidence"]
+    for header in DIMENSION_HEADERS:
+        bullets = [
+            f"- {rng.choice(_POSITIVE if rng.random() < 0.6 else _NEGATIVE).capitalize()} "
+            f"{header.lower()} provision noted by inspectors."
+            for _ in range(rng.randint(2, 8))
+        ]
+        sections.append(f"## {header}\n" + "\n".join(bullets))
+    return "\n\n".join(sections) + "\n"
+
+
+def write_corpus(
+    schools: Sequence[School],
+    dimensions: Sequence[str],
+    *,
+    facts_per_dimension: int = 4,
+) -> None:
+    """Write a raw file and an evidence file per school, plus an empty scoring grid.
+
+    Call after ``paths.set_project_root`` so the files land in the benchmark tree.
+    """
+
+    ensure_directories()
+    grid_path: Path = scoring_grid()
+    grid_path.parent.mkdir(parents=True, exist_ok=True)
+    grid_path.write_text(GRID_TEMPLATE, encoding="utf-8")
+    for school in schools:
+        document = RawDocument.open(school, dimensions)
+        for dimension in dimensions:
+            output = research_output(school.name, dimension, facts_per_dimension)
+            document.append_run(DimensionRun(dimension, output, "2026-01-01T00:00:00+00:00"))
+        document.commit()
+        evidence_file(school.slug).write_text(evidence_output(school.name), encoding="utf-8")
+
+
+__all__ = [
+    "GRID_TEMPLATE",
+    "evidence_output",
+    "research_output",
+    "synthetic_schools",
+    "write_corpus",
+]
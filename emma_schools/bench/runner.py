@@ -0,0 +1,255 @@
+"""Time the pipelines against synthetic corpora and keep the results for comparison.
+
+Each scale runs in its own temporary project root: a synthetic corpus is
+written, the network and model calls are replaced by stand-ins and the raw,
+evidence, score and grid stages are timed. Reports are saved under
+``data/benchmarks/`` and compared with the previous report that used the same
+settings, so a slowdown between versions is flagged.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import List, Sequence
+
+from emma_schools.bench.corpus import synthetic_schools, write_corpus
+from emma_schools.bench.stand_ins import Latency, use_stand_ins
+from emma_schools.core import paths
+from emma_schools.core.files import atomic_write_text
+from emma_schools.core.journal import new_run_id
+from emma_schools.pipelines import grid, raw_facts, scoring, synthesis
+
+LOGGER = logging.getLogger(__name__)
+
+STAGES = ("raw", "evidence", "score", "grid")
+DEFAULT_SCALES = (10, 100, 1000)
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+
+@dataclass(slots=True)
+class StageTiming:
+    schools: int
+    stage: str
+    items: int
+    seconds: float
+
+
+@dataclass(slots=True)
+class Regression:
+    schools: int
+    stage: str
+    before: float
+    after: float
+
+    @property
+    def change(self) -> float:
+        return self.after / self.before - 1 if self.before else 0.0
+
+
+def _timed(schools: int, stage: str, items: int, func, *args, **kwargs) -> StageTiming:
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    timing = StageTiming(schools, stage, items, time.perf_counter() - started)
+    LOGGER.info("Bench | schools=%s | stage=%s | items=%s | %.3fs", schools, stage, items, timing.seconds)
+    return timing
+
+
+def run_scale(
+    count: int,
+    *,
+    dimensions: Sequence[str],
+    latency: Latency,
+    stages: Sequence[str] = STAGES,
+    workers: int = 4,
+    llm_schools: int = 50,
+    facts_per_dimension: int = 4,
+) -> List[StageTiming]:
+    """Benchmark one corpus size in a throwaway project root.
+
+    The raw and evidence stages run on the first ``llm_schools`` schools only,
+    since every task there pays the stand-in latency; scoring and the grid
+    cover the whole corpus.
+    """
+
+    timings: List[StageTiming] = []
+    with tempfile.TemporaryDirectory(prefix="emma-bench-") as tmp:
+        previous = paths.set_project_root(Path(tmp))
+        try:
+            schools = synthetic_schools(count)
+            started = time.perf_counter()
+            write_corpus(schools, dimensions, facts_per_dimension=facts_per_dimension)
+            LOGGER.info(
+                "Bench | schools=%s | corpus written in %.2fs", count, time.perf_counter() - started
+            )
+            targets = schools[:llm_schools]
+            with use_stand_ins(latency):
+                if "raw" in stages:
+                    timings.append(
+                        _timed(
+                            count,
+                            "raw",
+                            len(targets) * len(dimensions),
+                            raw_facts.run_for_all,
+                            targets,
+                            dimensions,
+                            workers=workers,
+                        )
+                    )
+                if "evidence" in stages:
+                    timings.append(
+                        _timed(
+                            count,
+                            "evidence",
+                            len(targets),
+                            synthesis.build_evidence_for_all,
+                            targets,
+                            concurrency=workers,
+                            force=True,
+                        )
+                    )
+            if "score" in stages:
+                timings.append(_timed(count, "score", count, scoring.score_all, schools))
+            if "grid" in stages:
+                timings.append(_timed(count, "grid", count, grid.update_scoring_grid))
+        finally:
+            paths.set_project_root(previous)
+    return timings
+
+
+def _git_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=paths.PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("emma-schools")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def run_benchmark(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    *,
+    dimensions: Sequence[str],
+    latency: Latency,
+    stages: Sequence[str] = STAGES,
+    workers: int = 4,
+    llm_schools: int = 50,
+    facts_per_dimension: int = 4,
+    quiet: bool = True,
+) -> dict:
+    """Run every scale and return the report (settings plus stage timings)."""
+
+    package_logger = logging.getLogger("emma_schools")
+    level = package_logger.level
+    if quiet:
+        # Per-school progress lines would dominate the runtime at large scales.
+        package_logger.setLevel(logging.WARNING)
+    try:
+        timings = [
+            timing
+            for count in scales
+            for timing in run_scale(
+                count,
+                dimensions=dimensions,
+                latency=latency,
+                stages=stages,
+                workers=workers,
+                llm_schools=llm_schools,
+                facts_per_dimension=facts_per_dimension,
+            )
+        ]
+    finally:
+        package_logger.setLevel(level)
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "version": _package_version(),
+        "python": platform.python_version(),
+        "settings": {
+            "scales": list(scales),
+            "dimensions": len(dimensions),
+            "stages": list(stages),
+            "latency": asdict(latency),
+            "workers": workers,
+            "llm_schools": llm_schools,
+            "facts_per_dimension": facts_per_dimension,
+        },
+        "timings": [asdict(timing) for timing in timings],
+    }
+
+
+def save_report(report: dict) -> Path:
+    path = paths.benchmark_dir() / f"{new_run_id()}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def previous_report(settings: dict, *, exclude: Path | None = None) -> dict | None:
+    """Return the newest saved report that used exactly ``settings``."""
+
+    directory = paths.benchmark_dir()
+    if not directory.exists():
+        return None
+    files = sorted(directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in files:
+        if exclude is not None and path == exclude:
+            continue
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if report.get("settings") == settings:
+            return report
+    return None
+
+
+def find_regressions(
+    current: dict,
+    previous: dict,
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> List[Regression]:
+    """Stages that got more than ``threshold`` (a fraction) slower than ``previous``."""
+
+    before = {(item["schools"], item["stage"]): item["seconds"] for item in previous["timings"]}
+    regressions: List[Regression] = []
+    for item in current["timings"]:
+        baseline = before.get((item["schools"], item["stage"]))
+        if baseline and item["seconds"] > baseline * (1 + threshold):
+            regressions.append(Regression(item["schools"], item["stage"], baseline, item["seconds"]))
+    return regressions
+
+
+__all__ = [
+    "DEFAULT_REGRESSION_THRESHOLD",
+    "DEFAULT_SCALES",
+    "STAGES",
+    "Regression",
+    "StageTiming",
+    "find_regressions",
+    "previous_report",
+    "run_benchmark",
+    "run_scale",
+    "save_report",
+]
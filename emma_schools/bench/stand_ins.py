@@ -0,0 +1,108 @@
+"""Local stand-ins for the network and model calls, with configurable latency."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List
+from unittest import mock
+
+from emma_schools.bench.corpus import evidence_output, research_output
+from emma_schools.deep_research import client, search
+from emma_schools.pipelines import synthesis
+
+
+@dataclass(slots=True)
+class Latency:
+    """Seconds each stand-in sleeps per call."""
+
+    search: float = 0.0
+    fetch: float = 0.0
+    llm: float = 0.0
+
+
+def _fake_search(latency: Latency):
+    def ddg_search(query: str, max_results: int = 4) -> List[dict]:
+        time.sleep(latency.search)
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        return [
+            {
+                "title": f"Result {index} for {query}",
+                "href": f"https://site-{digest[index]}.example.org/{digest[:12]}/{index}",
+                "body": f"Snippet {index} about {query}.",
+            }
+            for index in range(max_results)
+        ]
+
+    return ddg_search
+
+
+def _fake_fetch(latency: Latency):
+    def fetch_url_text(url: str, *, timeout: int = 12, max_chars: int = 4000) -> str:
+        time.sleep(latency.fetch)
+        paragraph = f"Page text from {url}. Inspectors found strong teaching and some concerns. "
+        return (paragraph * (max_chars // len(paragraph) + 1))[:max_chars]
+
+    return fetch_url_text
+
+
+def _bold_after(text: str, label: str) -> str:
+    match = re.search(rf"{label}\s*\*\*(.+?)\*\*", text)
+    return match.group(1) if match else ""
+
+
+def _fake_research_completion(latency: Latency):
+    def run_chat_completion(messages: List[dict], **_: object) -> str:
+        time.sleep(latency.llm)
+        prompt = messages[-1]["content"]
+        school = _bold_after(prompt, "research on") or "Synthetic School"
+        dimension = _bold_after(prompt, "DIMENSION:").lower() or "general"
+        return research_output(school, dimension)
+
+    return run_chat_completion
+
+
+def _evidence_school(messages: List[dict]) -> str:
+    return _bold_after(messages[-1]["content"], "RAW FACTS for") or "Synthetic School"
+
+
+def _fake_evidence_completion(latency: Latency):
+    def run_chat_completion(messages: List[dict], **_: object) -> str:
+        time.sleep(latency.llm)
+        return evidence_output(_evidence_school(messages))
+
+    async def run_chat_completion_async(messages: List[dict], **_: object) -> str:
+        await asyncio.sleep(latency.llm)
+        return evidence_output(_evidence_school(messages))
+
+    return run_chat_completion, run_chat_completion_async
+
+
+@contextmanager
+def use_stand_ins(latency: Latency) -> Iterator[None]:
+    """Replace search, page fetches and model calls for the duration of the block.
+
+    The disk caches are disabled too, so every call pays the configured latency.
+    """
+
+    evidence_sync, evidence_async = _fake_evidence_completion(latency)
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(search, "ddg_search", _fake_search(latency)))
+        stack.enter_context(mock.patch.object(search, "fetch_url_text", _fake_fetch(latency)))
+        stack.enter_context(
+            mock.patch.object(client, "run_chat_completion", _fake_research_completion(latency))
+        )
+        stack.enter_context(mock.patch.object(synthesis, "run_chat_completion", evidence_sync))
+        stack.enter_context(
+            mock.patch.object(synthesis, "run_chat_completion_async", evidence_async)
+        )
+        for store in (search.PAGE_CACHE, search.SEARCH_CACHE, client.RESPONSE_CACHE):
+            stack.enter_context(mock.patch.object(store, "enabled", False))
+        yield
+
+
+__all__ = ["Latency", "use_stand_ins"]
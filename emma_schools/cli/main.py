@@ -3,45 +3,123 @@
 from __future__ import annotations
 
 import logging
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import List, Optional
 
 import typer
 
-from emma_schools.config import School, load_dimensions, load_schools
-from emma_schools.core.slugs import to_slug
-from emma_schools.pipelines import grid as grid_pipeline
-from emma_schools.pipelines import raw_facts, scoring, synthesis
+from emma_schools.config import REGISTRY, School
+from emma_schools.core import metrics
+from emma_schools.core.journal import new_run_id
+
+# Pipelines are imported inside the commands that use them: the research and
+# synthesis modules pull in openai, requests and duckduckgo_search, which local
+# commands such as ``grid`` and ``score`` never need.
+
+LOGGER = logging.getLogger(__name__)
 
 app = typer.Typer(add_completion=False, help="Emma Schools automation CLI.")
 
+_DURATION_RE = re.compile(r"^\s*(\d+)\s*([mhdw])\s*$", flags=re.IGNORECASE)
+_DURATION_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
 
 def _configure_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
 
 
-def _resolve_school(schools: List[School], identifier: str) -> School:
-    slug = to_slug(identifier)
-    for school in schools:
-        if school.slug == slug or school.name.lower() == identifier.lower():
-            return school
-    raise typer.BadParameter(f"School not found: {identifier}")
+def _resolve_school(identifier: str) -> School:
+    school = REGISTRY.find_school(identifier)
+    if school is None:
+        raise typer.BadParameter(f"School not found: {identifier}")
+    return school
+
+
+def _parse_max_age(value: Optional[str]) -> Optional[timedelta]:
+    if not value:
+        return None
+    match = _DURATION_RE.match(value)
+    if not match:
+        raise typer.BadParameter(f"Invalid duration: {value} (use e.g. 12h, 14d, 2w)")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit.lower()]: int(amount)})
 
 
 def _normalize_dimensions(dimensions: Optional[List[str]]) -> List[str]:
+    config = REGISTRY.snapshot()
     if not dimensions:
-        return load_dimensions()
-    known = set(load_dimensions())
+        return list(config.dimensions)
     normalized = [dimension.lower() for dimension in dimensions]
     for dimension in normalized:
-        if dimension not in known:
+        if dimension not in config.dimension_set:
             raise typer.BadParameter(f"Unknown dimension: {dimension}")
     return normalized
 
 
+def _response_cache_mode(no_cache: bool, cache_only: bool, refresh: bool) -> str:
+    if sum((no_cache, cache_only, refresh)) > 1:
+        raise typer.BadParameter("Use only one of --no-cache, --cache-only and --refresh.")
+    if no_cache:
+        return "off"
+    if cache_only:
+        return "only"
+    if refresh:
+        return "refresh"
+    return "use"
+
+
+def _log_cache_stats() -> None:
+    # Only report on caches that the command actually loaded.
+    search = sys.modules.get("emma_schools.deep_research.search")
+    if search is not None:
+        search.log_cache_stats()
+    client = sys.modules.get("emma_schools.deep_research.client")
+    if client is not None:
+        client.RESPONSE_CACHE.log_stats()
+
+
+def _write_run_metrics(command: str, started: datetime, prometheus: Optional[Path]) -> None:
+    path = metrics.write_run_metrics(
+        new_run_id(), command=command, started=started, prometheus_path=prometheus
+    )
+    if path is not None:
+        LOGGER.info("Run metrics written to %s", path)
+
+
 @app.callback()
-def main(verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable debug logging.")) -> None:
+def main(
+    ctx: typer.Context,
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable debug logging."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the model response cache."),
+    cache_only: bool = typer.Option(
+        False, "--cache-only", help="Serve model responses from the cache only; never call the API."
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Call the model again and overwrite cached responses."
+    ),
+    prometheus: Optional[Path] = typer.Option(
+        None,
+        "--prometheus",
+        envvar="EMMA_PROMETHEUS_TEXTFILE",
+        help="Also write run metrics to this Prometheus textfile.",
+    ),
+) -> None:
     _configure_logging(verbose)
+    mode = _response_cache_mode(no_cache, cache_only, refresh)
+    if mode != "use":
+        from emma_schools.deep_research import client
+
+        client.set_response_cache_mode(mode)
+    ctx.call_on_close(_log_cache_stats)
+    if ctx.invoked_subcommand not in ("stats", "bench"):
+        started = datetime.now(timezone.utc)
+        ctx.call_on_close(
+            lambda: _write_run_metrics(ctx.invoked_subcommand or "", started, prometheus)
+        )
 
 
 @app.command()
@@ -54,22 +132,33 @@ def raw(
         help="Run for every dimension (default when --dimension is not provided).",
     ),
     all_schools: bool = typer.Option(False, "--all", help="Process every school."),
+    refresh_search: bool = typer.Option(
+        False, "--refresh-search", help="Ignore cached search results and query again."
+    ),
+    workers: int = typer.Option(1, "--workers", min=1, help="Research tasks to run concurrently."),
+    max_age: Optional[str] = typer.Option(
+        None, "--max-age", help="Only refresh dimensions last researched longer ago than this (e.g. 14d)."
+    ),
 ) -> None:
     """Run Deep Research for raw facts."""
+    from emma_schools.deep_research import search
+    from emma_schools.pipelines import raw_facts
 
-    schools = load_schools()
     dims = _normalize_dimensions([dimension] if dimension else None)
+    age = _parse_max_age(max_age)
+    search.SEARCH_CACHE.configure(refresh=refresh_search)
     if all_schools:
-        target_dims = dims if not all_dimensions and dimension else load_dimensions()
-        raw_facts.run_for_all(schools, target_dims)
-        return
-
-    if not school:
-        raise typer.BadParameter("Provide --school or use --all.")
+        target_dims = dims if not all_dimensions and dimension else list(REGISTRY.dimensions)
+        failures = raw_facts.run_for_all(REGISTRY.schools, target_dims, workers=workers, max_age=age)
+    else:
+        if not school:
+            raise typer.BadParameter("Provide --school or use --all.")
 
-    target = _resolve_school(schools, school)
-    target_dims = dims if (dimension and not all_dimensions) else load_dimensions()
-    raw_facts.run_for_school(target, target_dims)
+        target = _resolve_school(school)
+        target_dims = dims if (dimension and not all_dimensions) else list(REGISTRY.dimensions)
+        failures = raw_facts.run_for_school(target, target_dims, workers=workers, max_age=age)
+    if failures:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -77,46 +166,242 @@ def evidence(
     school: Optional[str] = typer.Option(None, "--school", help="Target school name or slug."),
     all_schools: bool = typer.Option(False, "--all", help="Process every school."),
     model: Optional[str] = typer.Option(None, "--model", help="Override OpenAI model for synthesis."),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        min=1,
+        help="Schools to synthesise concurrently with --all (default 4).",
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Rebuild evidence even when the raw file is unchanged."
+    ),
+    batch: bool = typer.Option(
+        False, "--batch", help="With --all, submit one OpenAI Batch job instead of live calls."
+    ),
+    poll_interval: float = typer.Option(
+        30.0, "--poll-interval", min=1.0, help="Seconds between Batch status checks."
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Stream the model output for a single school."
+    ),
 ) -> None:
     """Generate structured evidence files from raw facts."""
-
-    schools = load_schools()
+    from emma_schools.pipelines import synthesis
+
+    schools = list(REGISTRY.schools)
+    if all_schools and batch:
+        errors = synthesis.build_evidence_batch(
+            schools, model=model, force=force, poll_interval=poll_interval
+        )
+        if errors:
+            raise typer.Exit(code=1)
+        return
     if all_schools:
-        synthesis.build_evidence_for_all(schools, model=model)
+        failures = synthesis.build_evidence_for_all(
+            schools,
+            model=model,
+            concurrency=concurrency or synthesis.DEFAULT_CONCURRENCY,
+            force=force,
+        )
+        if failures:
+            raise typer.Exit(code=1)
         return
 
     if not school:
         raise typer.BadParameter("Provide --school or use --all.")
 
-    target = _resolve_school(schools, school)
-    synthesis.build_evidence_for_school(target, model=model)
+    target = _resolve_school(school)
+    synthesis.build_evidence_for_school(target, model=model, stream=stream)
 
 
 @app.command()
-def score() -> None:
+def score(
+    workers: int = typer.Option(1, "--workers", min=1, help="Processes to score evidence files with."),
+) -> None:
     """Compute scores for all schools and regenerate the CSV."""
+    from emma_schools.pipelines import scoring
 
-    schools = load_schools()
-    scoring.score_all(schools)
+    schools = list(REGISTRY.schools)
+    scoring.score_all(schools, workers=workers)
 
 
 @app.command()
 def grid() -> None:
     """Regenerate the scoring grid Markdown."""
+    from emma_schools.pipelines import grid as grid_pipeline
 
     grid_pipeline.update_scoring_grid()
 
 
+@app.command()
+def rank(
+    weights: Optional[List[str]] = typer.Option(
+        None,
+        "--weights",
+        help="Weight profile, e.g. academics=0.4,fit=0.3 (repeatable; unlisted dimensions weigh 0).",
+    ),
+    top: int = typer.Option(10, "--top", min=1, help="Schools to list per profile."),
+) -> None:
+    """Re-rank schools under other weightings using the scores saved by `emma score`."""
+    from emma_schools.pipelines import ranking
+
+    try:
+        matrix = ranking.load_score_matrix()
+    except (FileNotFoundError, ValueError) as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1) from exc
+    try:
+        profiles = [ranking.parse_weights(spec, matrix.dimensions) for spec in weights or []]
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    for result in ranking.rank(matrix, profiles, top=top):
+        total = sum(result.weights.values())
+        label = ", ".join(
+            f"{dimension}={weight / total:.2f}" for dimension, weight in result.weights.items() if weight
+        )
+        typer.echo(f"Weights: {label}")
+        for position, row in enumerate(result.order, start=1):
+            typer.echo(f"{position:>4}. {matrix.names[row]:<40} {result.overall[row]:.2f}")
+        typer.echo("")
+
+
 @app.command("full-run")
-def full_run() -> None:
+def full_run(
+    refresh_search: bool = typer.Option(
+        False, "--refresh-search", help="Ignore cached search results and query again."
+    ),
+    workers: int = typer.Option(1, "--workers", min=1, help="Research tasks to run concurrently."),
+    force: bool = typer.Option(
+        False, "--force", help="Rebuild evidence even when the raw file is unchanged."
+    ),
+    max_age: Optional[str] = typer.Option(
+        None, "--max-age", help="Only refresh dimensions last researched longer ago than this (e.g. 14d)."
+    ),
+    resume: Optional[str] = typer.Option(
+        None, "--resume", help="Continue an interrupted run, skipping its completed units."
+    ),
+) -> None:
     """Execute the entire pipeline end-to-end."""
+    from emma_schools.core.journal import RunJournal
+    from emma_schools.deep_research import search
+    from emma_schools.pipelines import full_run as full_run_pipeline
+
+    schools = list(REGISTRY.schools)
+    dimensions = list(REGISTRY.dimensions)
+    age = _parse_max_age(max_age)
+    search.SEARCH_CACHE.configure(refresh=refresh_search)
+    if resume:
+        try:
+            journal = RunJournal.open(resume)
+        except FileNotFoundError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+        LOGGER.info("Resuming run %s (%s units already complete)", journal.run_id, len(journal))
+    else:
+        journal = RunJournal.create()
+        LOGGER.info("Run id %s (continue with: emma full-run --resume %s)", journal.run_id, journal.run_id)
+    metrics.METRICS.labels["journal"] = journal.run_id
+    result = full_run_pipeline.run_pipeline(
+        schools, dimensions, workers=workers, max_age=age, force=force, journal=journal
+    )
+    if result.failures:
+        raise typer.Exit(code=1)
 
-    schools = load_schools()
-    dimensions = load_dimensions()
-    raw_facts.run_for_all(schools, dimensions)
-    synthesis.build_evidence_for_all(schools)
-    scoring.score_all(schools)
-    grid_pipeline.update_scoring_grid()
+
+@app.command()
+def stats(
+    runs: int = typer.Option(20, "--runs", min=1, help="Number of recent runs to summarise."),
+    command: Optional[str] = typer.Option(
+        None, "--command", help="Only include runs of this command (e.g. full-run)."
+    ),
+) -> None:
+    """Summarise per-stage latency and counters across recent runs."""
+
+    recent = metrics.load_recent_runs(runs, command=command)
+    if not recent:
+        typer.echo("No run metrics recorded yet.")
+        return
+    stages, counters = metrics.combine_runs(recent)
+    typer.echo(f"Runs: {len(recent)} ({recent[0]['run_id']} .. {recent[-1]['run_id']})")
+    typer.echo("")
+    typer.echo(f"{'stage':<22} {'calls':>7} {'total s':>9} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    for stage, summary in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+        typer.echo(
+            f"{stage:<22} {summary['count']:>7} {summary['total']:>9.2f} "
+            f"{summary['p50']:>8.3f} {summary['p95']:>8.3f} {summary['max']:>8.3f}"
+        )
+    if counters:
+        typer.echo("")
+        for name, value in sorted(counters.items()):
+            typer.echo(f"{name:<32} {value:>12g}")
+
+
+@app.command()
+def bench(
+    schools: Optional[List[int]] = typer.Option(
+        None, "--schools", min=1, help="Corpus size to benchmark (repeatable; default 10, 100, 1000)."
+    ),
+    stage: Optional[List[str]] = typer.Option(
+        None, "--stage", help="Stage to time: raw, evidence, score or grid (repeatable; default all)."
+    ),
+    search_latency: float = typer.Option(0.0, "--search-latency", min=0.0, help="Seconds per search."),
+    fetch_latency: float = typer.Option(0.0, "--fetch-latency", min=0.0, help="Seconds per page fetch."),
+    llm_latency: float = typer.Option(0.0, "--llm-latency", min=0.0, help="Seconds per model call."),
+    workers: int = typer.Option(4, "--workers", min=1, help="Concurrency for the raw and evidence stages."),
+    llm_schools: int = typer.Option(
+        50, "--llm-schools", min=1, help="Schools put through the raw and evidence stages per scale."
+    ),
+    threshold: Optional[float] = typer.Option(
+        None,
+        "--threshold",
+        min=0.0,
+        help="Flag stages this fraction slower than the last matching report (default 0.2).",
+    ),
+    save: bool = typer.Option(True, "--save/--no-save", help="Keep the report in data/benchmarks/."),
+) -> None:
+    """Benchmark the pipelines offline on synthetic schools."""
+    from emma_schools import bench as bench_suite
+    from emma_schools.bench.runner import DEFAULT_REGRESSION_THRESHOLD
+
+    stages = [name.lower() for name in stage] if stage else list(bench_suite.STAGES)
+    for name in stages:
+        if name not in bench_suite.STAGES:
+            raise typer.BadParameter(f"Unknown stage: {name}")
+    latency = bench_suite.Latency(search=search_latency, fetch=fetch_latency, llm=llm_latency)
+    report = bench_suite.run_benchmark(
+        schools or list(bench_suite.DEFAULT_SCALES),
+        dimensions=list(REGISTRY.dimensions),
+        latency=latency,
+        stages=stages,
+        workers=workers,
+        llm_schools=llm_schools,
+        quiet=not LOGGER.isEnabledFor(logging.DEBUG),
+    )
+    typer.echo(f"{'schools':>8} {'stage':<9} {'items':>7} {'seconds':>9} {'ms/item':>9}")
+    for item in report["timings"]:
+        per_item = item["seconds"] * 1000 / item["items"] if item["items"] else 0.0
+        typer.echo(
+            f"{item['schools']:>8} {item['stage']:<9} {item['items']:>7} "
+            f"{item['seconds']:>9.3f} {per_item:>9.2f}"
+        )
+
+    path = bench_suite.save_report(report) if save else None
+    if path is not None:
+        typer.echo(f"Saved {path}")
+    previous = bench_suite.previous_report(report["settings"], exclude=path)
+    if previous is None:
+        return
+    if threshold is None:
+        threshold = DEFAULT_REGRESSION_THRESHOLD
+    regressions = bench_suite.find_regressions(report, previous, threshold=threshold)
+    typer.echo(f"Compared with {previous['commit']} ({previous['created']})")
+    for regression in regressions:
+        typer.echo(
+            f"  REGRESSION {regression.stage} at {regression.schools} schools: "
+            f"{regression.before:.3f}s -> {regression.after:.3f}s (+{regression.change:.0%})"
+        )
+    if regressions:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+"""Import-time budget for the ``emma`` CLI's local commands.
+
+Runs ``python -X importtime -m emma_schools.cli.main <command>`` for the
+commands that only touch local files, in a throwaway project tree with an empty
+school CSV and scoring grid (``EMMA_PROJECT_ROOT``), so the pipelines each
+command imports lazily are timed too. Fails when a command imports a heavy
+network/LLM dependency or numpy, or when the package's own imports exceed the
+budget::
+
+    python -m emma_schools.cli.startup_budget            # exit 1 on a breach
+    EMMA_IMPORT_BUDGET_MS=60 python -m emma_schools.cli.startup_budget
+
+Only top-level imports made by ``emma_schools`` modules are counted, so the
+interpreter's own startup and typer's output do not skew the result. ``rank``
+is left out: it needs numpy by design.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Sequence
+
+HEAVY_MODULES = frozenset({"openai", "requests", "duckduckgo_search", "bs4", "numpy"})
+LOCAL_COMMANDS = ("grid", "score", "stats")
+DEFAULT_BUDGET_MS = float(os.getenv("EMMA_IMPORT_BUDGET_MS", "100"))
+
+
+@dataclass(slots=True)
+class ImportReport:
+    command: str
+    package_ms: float = 0.0
+    heavy: List[str] = field(default_factory=list)
+
+
+def parse_importtime(command: str, stderr: str) -> ImportReport:
+    """Sum the cumulative time of top-level ``emma_schools`` imports in ``-X importtime`` output."""
+
+    report = ImportReport(command)
+    heavy = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # the header row
+        name_field = parts[2]
+        name = name_field.strip()
+        top_package = name.split(".")[0]
+        if top_package in HEAVY_MODULES:
+            heavy.add(top_package)
+        depth = (len(name_field) - len(name_field.lstrip()) - 1) // 2
+        if depth == 0 and top_package == "emma_schools":
+            report.package_ms += int(parts[1]) / 1000
+    report.heavy = sorted(heavy)
+    return report
+
+
+def seed_project(root: Path) -> None:
+    """Create the files the local commands need in an otherwise empty project tree."""
+
+    (root / "data").mkdir(parents=True, exist_ok=True)
+    (root / "data" / "schools.csv").write_text("School,Overall\n", encoding="utf-8")
+    grid_path = root / "docs" / "synthesis" / "scoring-grid.md"
+    grid_path.parent.mkdir(parents=True, exist_ok=True)
+    grid_path.write_text(
+        "# Scoring Grid\n\n<!-- GRID:BEGIN -->\n<!-- GRID:END -->\n", encoding="utf-8"
+    )
+
+
+def measure(command: str, root: Path) -> ImportReport:
+    """Run ``emma <command>`` against the project tree at ``root`` and parse its import times."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "emma_schools.cli.main", command],
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "EMMA_PROJECT_ROOT": str(root)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"emma {command} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(command, result.stderr)
+
+
+def main(commands: Sequence[str] = LOCAL_COMMANDS, budget_ms: float = DEFAULT_BUDGET_MS) -> int:
+    with tempfile.TemporaryDirectory(prefix="emma-startup-") as tmp:
+        root = Path(tmp)
+        seed_project(root)
+        reports = [measure(command, root) for command in commands]
+    failed = False
+    for report in reports:
+        problems = []
+        if report.heavy:
+            problems.append(f"imports {', '.join(report.heavy)}")
+        if report.package_ms > budget_ms:
+            problems.append(f"over budget ({budget_ms:.0f} ms)")
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"emma {report.command:<6} {report.package_ms:7.1f} ms  {status}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+__all__ = [
+    "HEAVY_MODULES",
+    "ImportReport",
+    "LOCAL_COMMANDS",
+    "main",
+    "measure",
+    "parse_importtime",
+    "seed_project",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,16 @@
 """Configuration helpers for Emma Schools."""
 
-from .loaders import load_dimensions, load_schools
-from .models import School
+from .loaders import load_dimensions, load_keywords, load_schools
+from .models import KeywordSet, School
+from .registry import REGISTRY, ConfigRegistry, ConfigSnapshot
 
-__all__ = ["load_dimensions", "load_schools", "School"]
+__all__ = [
+    "load_dimensions",
+    "load_keywords",
+    "load_schools",
+    "KeywordSet",
+    "School",
+    "REGISTRY",
+    "ConfigRegistry",
+    "ConfigSnapshot",
+]
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, List
 
 import yaml
 
-from emma_schools.config.models import School
+from emma_schools.config.models import KeywordSet, School
 
 CONFIG_DIR = Path(__file__).resolve().parent
 
@@ -29,4 +29,9 @@ def load_dimensions() -> List[str]:
     return list(_load_yaml("dimensions.yml").get("dimensions", []))
 
 
-__all__ = ["load_schools", "load_dimensions"]
+def load_keywords() -> Dict[str, KeywordSet]:
+    raw = _load_yaml("keywords.yml")
+    return {polarity: KeywordSet.from_dict(raw.get(polarity, {})) for polarity in ("positive", "negative")}
+
+
+__all__ = ["load_schools", "load_dimensions", "load_keywords"]
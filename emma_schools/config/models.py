@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
 from emma_schools.core.slugs import to_slug
 
@@ -13,6 +14,7 @@ class School:
     slug: str
     phase: str = ""
     notes: str = ""
+    aliases: List[str] = field(default_factory=list)
 
     @classmethod
     def from_dict(cls, data: dict) -> "School":
@@ -22,7 +24,21 @@ class School:
             slug=slug,
             phase=data.get("phase", ""),
             notes=data.get("notes", ""),
+            aliases=[str(alias) for alias in data.get("aliases") or []],
         )
 
 
-__all__ = ["School"]
+@dataclass(slots=True)
+class KeywordSet:
+    weight: float
+    keywords: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KeywordSet":
+        return cls(
+            weight=float(data.get("weight", 0.0)),
+            keywords=[str(keyword).lower() for keyword in data.get("keywords", [])],
+        )
+
+
+__all__ = ["School", "KeywordSet"]
@@ -0,0 +1,117 @@
+"""Process-wide, memoized view of the YAML configuration.
+
+``REGISTRY`` parses the config files once and serves every later lookup from
+an immutable snapshot with prebuilt school indexes. The snapshot is rebuilt
+when any config file's mtime changes (checked at most once per
+``check_interval`` seconds) or after ``invalidate()``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Tuple
+
+from emma_schools.config import loaders
+from emma_schools.config.models import KeywordSet, School
+from emma_schools.core.slugs import to_slug
+
+CONFIG_FILES = ("schools.yml", "dimensions.yml", "keywords.yml")
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    schools: Tuple[School, ...]
+    dimensions: Tuple[str, ...]
+    keywords: Dict[str, KeywordSet]
+    dimension_set: FrozenSet[str] = field(init=False)
+    _index: Dict[str, School] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        index: Dict[str, School] = {}
+        # Aliases first so a school's own slug or name always wins a clash.
+        for school in self.schools:
+            for alias in school.aliases:
+                index.setdefault(alias.lower(), school)
+                index.setdefault(to_slug(alias), school)
+        for school in self.schools:
+            index[school.name.lower()] = school
+        for school in self.schools:
+            index[school.slug] = school
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "dimension_set", frozenset(self.dimensions))
+
+    def find_school(self, identifier: str) -> School | None:
+        """Look a school up by slug, name or alias (case-insensitive)."""
+
+        key = identifier.strip()
+        return self._index.get(key.lower()) or self._index.get(to_slug(key))
+
+
+class ConfigRegistry:
+    """Loads the config directory once and reloads it when a file changes."""
+
+    def __init__(self, *, check_interval: float = 1.0) -> None:
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: ConfigSnapshot | None = None
+        self._stamp: Tuple[int, ...] = ()
+        self._checked = 0.0
+
+    def _file_stamp(self) -> Tuple[int, ...]:
+        stamps = []
+        for name in CONFIG_FILES:
+            try:
+                stamps.append((loaders.CONFIG_DIR / name).stat().st_mtime_ns)
+            except FileNotFoundError:
+                stamps.append(0)
+        return tuple(stamps)
+
+    def snapshot(self) -> ConfigSnapshot:
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked < self.check_interval:
+            return snapshot
+        with self._lock:
+            stamp = self._file_stamp()
+            if self._snapshot is None or stamp != self._stamp:
+                self._snapshot = ConfigSnapshot(
+                    schools=tuple(loaders.load_schools()),
+                    dimensions=tuple(loaders.load_dimensions()),
+                    keywords=loaders.load_keywords(),
+                )
+                self._stamp = stamp
+            self._checked = now
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    @property
+    def schools(self) -> Tuple[School, ...]:
+        return self.snapshot().schools
+
+    @property
+    def dimensions(self) -> Tuple[str, ...]:
+        return self.snapshot().dimensions
+
+    @property
+    def keywords(self) -> Dict[str, KeywordSet]:
+        return self.snapshot().keywords
+
+    def find_school(self, identifier: str) -> School | None:
+        return self.snapshot().find_school(identifier)
+
+    def get_school(self, identifier: str) -> School:
+        school = self.find_school(identifier)
+        if school is None:
+            raise KeyError(f"School not found: {identifier}")
+        return school
+
+
+REGISTRY = ConfigRegistry()
+
+
+__all__ = ["CONFIG_FILES", "ConfigRegistry", "ConfigSnapshot", "REGISTRY"]
@@ -0,0 +1,223 @@
+"""Small SQLite-backed key/value cache with size-bounded LRU eviction."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from emma_schools.core import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+# Eviction trims the cache to this fraction of ``max_bytes`` so that the next
+# writes do not immediately trigger another eviction pass.
+_EVICT_TO = 0.9
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: dict
+    stored_at: float
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class DiskCache:
+    """JSON values keyed by string, stored in a single SQLite file.
+
+    Expiry policy is left to callers (``CacheEntry.stored_at``) so that stale
+    entries can still be revalidated. Once the stored payload exceeds
+    ``max_bytes`` the least recently accessed entries are evicted. The payload
+    size is tracked as a running total, so writes do not rescan the table.
+    """
+
+    def __init__(self, path: Path, *, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._total = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._total = self._stored_bytes(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return total
+
+    @staticmethod
+    def _size_of(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+        return CacheEntry(value=json.loads(row[0]), stored_at=row[1])
+
+    def set(self, key: str, value: dict) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                replaced = self._size_of(conn, key)
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now, now),
+                )
+                self._total += size - replaced
+                if self._total > self.max_bytes:
+                    self._evict(conn)
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly stored without rewriting its value."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                self._total -= self._size_of(conn, key)
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Resync first: other processes may have written to the same file.
+        total = self._stored_bytes(conn)
+        if total > self.max_bytes:
+            target = int(self.max_bytes * _EVICT_TO)
+            evicted = 0
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC")
+            for key, size in rows.fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+            LOGGER.debug("Evicted %s entries from %s", evicted, self.path.name)
+        self._total = total
+
+
+class CacheStore:
+    """A lazily opened ``DiskCache`` plus the process-wide policy around it.
+
+    Pipelines share one store per cache file; the CLI adjusts the policy
+    (enable/disable, TTL, forced refresh) through ``configure``. A ``ttl`` of
+    ``None`` means entries never expire.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        path: Path,
+        ttl: int | None,
+        max_bytes: int,
+        enabled: bool = True,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.refresh = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._cache: DiskCache | None = None
+
+    def configure(
+        self,
+        *,
+        enabled: bool | None = None,
+        ttl: int | None = None,
+        max_bytes: int | None = None,
+        refresh: bool | None = None,
+    ) -> None:
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if ttl is not None:
+                self.ttl = ttl
+            if refresh is not None:
+                self.refresh = refresh
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+                if self._cache is not None:
+                    self._cache.max_bytes = max_bytes
+
+    @property
+    def cache(self) -> DiskCache | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._cache is None:
+                self._cache = DiskCache(self.path, max_bytes=self.max_bytes)
+            return self._cache
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        """Return the stored entry (fresh or stale) unless a refresh is forced."""
+        cache = self.cache
+        if cache is None or self.refresh:
+            return None
+        return cache.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.ttl is None or entry.age() < self.ttl
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.incr(f"cache.{self.name.lower()}.{'hits' if hit else 'misses'}")
+
+    def log_stats(self) -> None:
+        if self.hits or self.misses:
+            LOGGER.info("%s cache | hits=%s | misses=%s", self.name, self.hits, self.misses)
+
+
+__all__ = ["CacheEntry", "CacheStore", "DiskCache"]
@@ -0,0 +1,29 @@
+"""File helpers shared by the pipelines."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to a sibling temp file, then move it over ``path``.
+
+    Readers see either the old content or the new content, never a partial
+    write, because ``os.replace`` is atomic on the same filesystem.
+    """
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Binary counterpart of :func:`atomic_write_text`."""
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+__all__ = ["atomic_write_bytes", "atomic_write_text"]
@@ -0,0 +1,101 @@
+"""Append-only journal of completed pipeline units, used to resume runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import secrets
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Set, Tuple
+
+from emma_schools.core.paths import run_journal
+
+_Unit = Tuple[str, str, str]
+
+
+def output_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def new_run_id() -> str:
+    """Sortable run id: UTC timestamp plus a short random suffix."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + secrets.token_hex(3)
+
+
+class RunJournal:
+    """Records each completed (stage, school, dimension) unit as one JSON line.
+
+    Lines are flushed and fsynced as they are written, so a crash loses at
+    most the unit that was in flight.
+    """
+
+    def __init__(self, run_id: str, path: Path, completed: Set[_Unit] | None = None) -> None:
+        self.run_id = run_id
+        self.path = path
+        self._completed: Set[_Unit] = completed or set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls) -> "RunJournal":
+        run_id = new_run_id()
+        path = run_journal(run_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return cls(run_id, path)
+
+    @classmethod
+    def open(cls, run_id: str) -> "RunJournal":
+        path = run_journal(run_id)
+        if not path.exists():
+            raise FileNotFoundError(f"No journal for run {run_id}: {path}")
+        data = path.read_bytes()
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            # A torn final line from a crash mid-write: drop it so the next
+            # record starts on a fresh line. That unit simply reruns.
+            with path.open("r+b") as handle:
+                handle.truncate(len(complete))
+                handle.flush()
+                os.fsync(handle.fileno())
+        completed: Set[_Unit] = set()
+        for line in complete.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            completed.add((entry["stage"], entry["school"], entry.get("dimension", "")))
+        return cls(run_id, path, completed)
+
+    def is_done(self, stage: str, school: str, dimension: str = "") -> bool:
+        with self._lock:
+            return (stage, school, dimension) in self._completed
+
+    def record(
+        self,
+        stage: str,
+        school: str,
+        dimension: str = "",
+        *,
+        output_hash: str = "",
+    ) -> None:
+        entry = {
+            "stage": stage,
+            "school": school,
+            "dimension": dimension,
+            "output_hash": output_hash,
+            "completed": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._completed.add((stage, school, dimension))
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+
+__all__ = ["RunJournal", "new_run_id", "output_digest"]
@@ -0,0 +1,230 @@
+"""Lightweight per-stage timings and counters, written once per run.
+
+Spans record wall-clock seconds per pipeline stage; counters accumulate
+bytes, tokens, cache hits and failures. ``write_run_metrics`` saves both as
+JSON under ``data/metrics/`` (and optionally as a Prometheus textfile) so
+``emma stats`` can compare recent runs.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, TypeVar
+
+from emma_schools.core.files import atomic_write_text
+from emma_schools.core.paths import metrics_dir, metrics_file
+
+LOGGER = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable)
+
+
+class Metrics:
+    """Thread-safe store of stage durations and named counters for one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._counters: Dict[str, float] = defaultdict(float)
+        self.labels: Dict[str, str] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._durations[stage].append(seconds)
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one ``stage`` sample; exceptions count as failures."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.incr(f"{stage}.failures")
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {stage: list(values) for stage, values in self._durations.items()},
+                "counters": dict(self._counters),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+            self.labels.clear()
+
+
+METRICS = Metrics()
+
+
+def span(stage: str):
+    return METRICS.span(stage)
+
+
+def incr(name: str, amount: float = 1) -> None:
+    METRICS.incr(name, amount)
+
+
+def observe(stage: str, seconds: float) -> None:
+    METRICS.observe(stage, seconds)
+
+
+def timed(stage: str) -> Callable[[_F], _F]:
+    """Decorator recording every call of a synchronous function as a ``stage`` span."""
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (``q`` in 0–100)."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(durations: List[float]) -> dict:
+    return {
+        "count": len(durations),
+        "total": sum(durations),
+        "p50": percentile(durations, 50),
+        "p95": percentile(durations, 95),
+        "max": max(durations, default=0.0),
+    }
+
+
+def _prometheus_name(name: str) -> str:
+    return "".join(char if char.isalnum() else "_" for char in name)
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+
+    lines = [
+        "# HELP emma_stage_seconds Wall-clock seconds per pipeline stage in the last run.",
+        "# TYPE emma_stage_seconds summary",
+    ]
+    for stage, durations in sorted(snapshot["stages"].items()):
+        stats = summarize(durations)
+        lines.append(f'emma_stage_seconds{{stage="{stage}",quantile="0.5"}} {stats["p50"]:.6f}')
+        lines.append(f'emma_stage_seconds{{stage="{stage}",quantile="0.95"}} {stats["p95"]:.6f}')
+        lines.append(f'emma_stage_seconds_sum{{stage="{stage}"}} {stats["total"]:.6f}')
+        lines.append(f'emma_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+    for name, value in sorted(snapshot["counters"].items()):
+        metric = f"emma_{_prometheus_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_run_metrics(
+    run_id: str,
+    *,
+    command: str,
+    started: datetime,
+    prometheus_path: Path | None = None,
+) -> Path | None:
+    """Write the current metrics for ``run_id``; returns the JSON path, or None if empty."""
+
+    snapshot = METRICS.snapshot()
+    if not snapshot["stages"] and not snapshot["counters"]:
+        return None
+    payload = {
+        "run_id": run_id,
+        "command": command,
+        "labels": dict(METRICS.labels),
+        "started": started.isoformat(),
+        "finished": datetime.now(timezone.utc).isoformat(),
+        "stages": {
+            stage: {"durations": [round(value, 6) for value in durations]}
+            for stage, durations in snapshot["stages"].items()
+        },
+        "counters": snapshot["counters"],
+    }
+    path = metrics_file(run_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(payload, indent=2, sort_keys=True))
+    if prometheus_path is not None:
+        prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(prometheus_path, render_prometheus(snapshot))
+    LOGGER.debug("Wrote run metrics to %s", path)
+    return path
+
+
+def load_recent_runs(limit: int, command: str | None = None) -> List[dict]:
+    """Return up to ``limit`` of the newest run metrics, oldest first."""
+
+    directory = metrics_dir()
+    if not directory.exists():
+        return []
+    runs: List[dict] = []
+    files = sorted(directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in files:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            LOGGER.warning("Skipping unreadable metrics file %s", path.name)
+            continue
+        if command and payload.get("command") != command:
+            continue
+        runs.append(payload)
+        if len(runs) >= limit:
+            break
+    return list(reversed(runs))
+
+
+def combine_runs(runs: List[dict]) -> tuple[Dict[str, dict], Dict[str, float]]:
+    """Pool stage samples and counter totals across ``runs``."""
+
+    durations: Dict[str, List[float]] = defaultdict(list)
+    counters: Dict[str, float] = defaultdict(float)
+    for run in runs:
+        for stage, data in run.get("stages", {}).items():
+            durations[stage].extend(data.get("durations", []))
+        for name, value in run.get("counters", {}).items():
+            counters[name] += value
+    return {stage: summarize(values) for stage, values in durations.items()}, dict(counters)
+
+
+__all__ = [
+    "METRICS",
+    "Metrics",
+    "combine_runs",
+    "incr",
+    "load_recent_runs",
+    "observe",
+    "percentile",
+    "render_prometheus",
+    "span",
+    "summarize",
+    "timed",
+    "write_run_metrics",
+]
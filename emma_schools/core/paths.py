@@ -1,18 +1,44 @@
-"""Helper functions for navigating the fixed repository layout."""
+"""Helper functions for navigating the fixed repository layout.
+
+The layout is rooted at the repository checkout unless ``EMMA_PROJECT_ROOT``
+points elsewhere.
+"""
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = Path(os.getenv("EMMA_PROJECT_ROOT") or Path(__file__).resolve().parents[2])
 RAW_DIR = PROJECT_ROOT / "raw"
 EVIDENCE_DIR = PROJECT_ROOT / "evidence"
 LOGIC_DIR = PROJECT_ROOT / "logic"
 DATA_DIR = PROJECT_ROOT / "data"
 DOCS_DIR = PROJECT_ROOT / "docs"
+CACHE_DIR = DATA_DIR / "cache"
 SCORING_GRID_PATH = DOCS_DIR / "synthesis" / "scoring-grid.md"
 
 
+def set_project_root(root: Path) -> Path:
+    """Point every repository path at ``root``; returns the previous root.
+
+    Used by the offline benchmarks to run the pipelines against a synthetic tree.
+    """
+
+    global PROJECT_ROOT, RAW_DIR, EVIDENCE_DIR, LOGIC_DIR, DATA_DIR, DOCS_DIR, CACHE_DIR
+    global SCORING_GRID_PATH
+    previous = PROJECT_ROOT
+    PROJECT_ROOT = Path(root)
+    RAW_DIR = PROJECT_ROOT / "raw"
+    EVIDENCE_DIR = PROJECT_ROOT / "evidence"
+    LOGIC_DIR = PROJECT_ROOT / "logic"
+    DATA_DIR = PROJECT_ROOT / "data"
+    DOCS_DIR = PROJECT_ROOT / "docs"
+    CACHE_DIR = DATA_DIR / "cache"
+    SCORING_GRID_PATH = DOCS_DIR / "synthesis" / "scoring-grid.md"
+    return previous
+
+
 def ensure_directories() -> None:
     """Create the required top-level directories if they do not exist."""
     for path in (RAW_DIR, EVIDENCE_DIR, LOGIC_DIR, DATA_DIR, DOCS_DIR / "synthesis"):
@@ -23,6 +49,10 @@ def raw_file(slug: str) -> Path:
     return RAW_DIR / f"{slug}-raw.md"
 
 
+def fact_index_file(slug: str) -> Path:
+    return RAW_DIR / f"{slug}-facts.jsonl"
+
+
 def evidence_file(slug: str) -> Path:
     return EVIDENCE_DIR / f"{slug}.md"
 
@@ -31,10 +61,50 @@ def data_csv() -> Path:
     return DATA_DIR / "schools.csv"
 
 
+def score_matrix() -> Path:
+    return DATA_DIR / "scores.npy"
+
+
+def score_index() -> Path:
+    return DATA_DIR / "scores-index.json"
+
+
+def score_cache() -> Path:
+    return DATA_DIR / "evidence-scores.json"
+
+
 def scoring_grid() -> Path:
     return SCORING_GRID_PATH
 
 
+def evidence_manifest() -> Path:
+    return DATA_DIR / "evidence-manifest.json"
+
+
+def batch_dir() -> Path:
+    return DATA_DIR / "batches"
+
+
+def run_journal(run_id: str) -> Path:
+    return DATA_DIR / "runs" / f"{run_id}.jsonl"
+
+
+def metrics_dir() -> Path:
+    return DATA_DIR / "metrics"
+
+
+def metrics_file(run_id: str) -> Path:
+    return metrics_dir() / f"{run_id}.json"
+
+
+def benchmark_dir() -> Path:
+    return DATA_DIR / "benchmarks"
+
+
+def cache_file(name: str) -> Path:
+    return CACHE_DIR / f"{name}.sqlite"
+
+
 __all__ = [
     "PROJECT_ROOT",
     "RAW_DIR",
@@ -42,10 +112,23 @@ __all__ = [
     "LOGIC_DIR",
     "DATA_DIR",
     "DOCS_DIR",
+    "CACHE_DIR",
     "SCORING_GRID_PATH",
+    "set_project_root",
     "ensure_directories",
     "raw_file",
+    "fact_index_file",
     "evidence_file",
     "data_csv",
+    "score_matrix",
+    "score_index",
+    "score_cache",
     "scoring_grid",
+    "evidence_manifest",
+    "batch_dir",
+    "run_journal",
+    "metrics_dir",
+    "metrics_file",
+    "benchmark_dir",
+    "cache_file",
 ]
@@ -0,0 +1,253 @@
+"""Shared rate limiting, adaptive concurrency and retry with backoff.
+
+A ``RateLimiter`` wraps calls to one provider. Every attempt takes a token
+from a ``TokenBucket`` (requests per second, with bursts) and a slot from an
+``AdaptiveConcurrency`` gate. Throttled calls halve the concurrency limit and
+pause the bucket, successful ones grow it back by one slot per window
+(additive increase, multiplicative decrease). Failed attempts that the
+provider's classifier marks as retryable are retried with jittered
+exponential backoff, waiting at least as long as any Retry-After hint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+
+from emma_schools.core import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_ASYNC_POLL_SECONDS = 0.05
+
+
+@dataclass(slots=True)
+class RetryDecision:
+    """How a failed attempt should be handled."""
+
+    retry: bool
+    throttled: bool = False
+    retry_after: float | None = None
+
+
+NO_RETRY = RetryDecision(retry=False)
+
+
+class TokenBucket:
+    """Allow ``rate`` calls per second on average with bursts of up to ``capacity``.
+
+    ``reserve`` hands out tokens in arrival order and returns how long the
+    caller must wait for its token; a ``rate`` of zero disables the limit.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for ``seconds`` and drop any saved-up burst."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """A concurrency gate whose limit shrinks on throttling and grows on success."""
+
+    def __init__(self, maximum: int, *, minimum: int = 1, initial: int | None = None) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = float(initial if initial is not None else self.maximum)
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self._active >= int(self._limit):
+                return False
+            self._active += 1
+            return True
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._active >= int(self._limit):
+                self._condition.wait()
+            self._active += 1
+
+    async def acquire_async(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(_ASYNC_POLL_SECONDS)
+
+    def release(self, *, succeeded: bool = True, throttled: bool = False) -> None:
+        with self._condition:
+            self._active -= 1
+            if throttled:
+                self._limit = max(float(self.minimum), self._limit / 2)
+            elif succeeded:
+                # Roughly one extra slot per full window of successful calls.
+                self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+
+@dataclass(slots=True)
+class Backoff:
+    """Jittered exponential backoff; ``attempts`` counts the first try."""
+
+    attempts: int = 5
+    base: float = 1.0
+    cap: float = 60.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        # "Full jitter": spread retries over the whole window so callers that
+        # failed together do not retry together.
+        delay = random.uniform(0, min(self.cap, self.base * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after + random.uniform(0, min(1.0, retry_after / 10)))
+        return delay
+
+
+class RateLimiter:
+    """Token bucket + adaptive concurrency + retries for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate: float,
+        burst: float | None = None,
+        max_concurrency: int,
+        backoff: Backoff | None = None,
+        classify: Callable[[BaseException], RetryDecision],
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.backoff = backoff or Backoff()
+        self.classify = classify
+
+    def _next_delay(self, exc: BaseException, decision: RetryDecision, attempt: int) -> float | None:
+        """Return the delay before the next attempt, or None to give up."""
+
+        if decision.throttled:
+            metrics.incr(f"{self.name}.throttled")
+        if not decision.retry or attempt + 1 >= self.backoff.attempts:
+            return None
+        delay = self.backoff.delay(attempt, decision.retry_after)
+        if decision.throttled:
+            self.bucket.pause(delay)
+        metrics.incr(f"{self.name}.retries")
+        LOGGER.warning(
+            "%s call failed (%s); retrying in %.1fs (attempt %s/%s, concurrency %s)",
+            self.name,
+            exc.__class__.__name__,
+            delay,
+            attempt + 2,
+            self.backoff.attempts,
+            self.concurrency.limit,
+        )
+        return delay
+
+    def call(self, func: Callable[..., _T], *args, **kwargs) -> _T:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self.concurrency.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                decision = self.classify(exc)
+                self.concurrency.release(succeeded=False, throttled=decision.throttled)
+                delay = self._next_delay(exc, decision, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.concurrency.release()
+            return result
+
+    async def call_async(self, func: Callable[..., Awaitable[_T]], *args, **kwargs) -> _T:
+        attempt = 0
+        while True:
+            await self.bucket.acquire_async()
+            await self.concurrency.acquire_async()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as exc:
+                decision = self.classify(exc)
+                self.concurrency.release(succeeded=False, throttled=decision.throttled)
+                delay = self._next_delay(exc, decision, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.concurrency.release()
+            return result
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date)."""
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+__all__ = [
+    "NO_RETRY",
+    "AdaptiveConcurrency",
+    "Backoff",
+    "RateLimiter",
+    "RetryDecision",
+    "TokenBucket",
+    "parse_retry_after",
+]
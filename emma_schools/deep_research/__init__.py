@@ -1,6 +1,19 @@
 """Deep Research client helpers."""
 
-from .client import run_chat_completion, run_deep_research
-from .prompts import RAW_PROMPT_BUILDERS, evidence_prompt
+from .client import (
+    resolve_chat_model,
+    run_chat_completion,
+    run_chat_completion_async,
+    run_deep_research,
+)
+from .prompts import EVIDENCE_PROMPT_VERSION, RAW_PROMPT_BUILDERS, evidence_prompt
 
-__all__ = ["run_deep_research", "run_chat_completion", "RAW_PROMPT_BUILDERS", "evidence_prompt"]
+__all__ = [
+    "run_deep_research",
+    "run_chat_completion",
+    "run_chat_completion_async",
+    "resolve_chat_model",
+    "RAW_PROMPT_BUILDERS",
+    "EVIDENCE_PROMPT_VERSION",
+    "evidence_prompt",
+]
@@ -0,0 +1,146 @@
+"""Helpers for running Responses API requests through the OpenAI Batch API.
+
+The client honours ``OPENAI_BASE_URL``, so the whole flow can be pointed at a
+local fake Batch endpoint.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from openai import NotFoundError
+
+from emma_schools.deep_research.client import LLM_LIMITER, resolve_chat_model, sync_client
+
+LOGGER = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/responses"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchNotFound(LookupError):
+    """Raised when the API no longer knows a batch id (expired, deleted or from another account)."""
+
+
+@dataclass(slots=True)
+class BatchResults:
+    status: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def build_request_line(custom_id: str, messages: List[dict], *, model: str | None = None) -> dict:
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {"model": resolve_chat_model(model), "input": messages},
+    }
+
+
+def write_batch_file(path: Path, lines: Iterable[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def submit_batch(path: Path, *, metadata: Dict[str, str] | None = None) -> str:
+    """Upload a JSONL request file and start a batch; returns the batch id."""
+
+    client = sync_client()
+
+    def _upload():
+        # Reopened per attempt so a retried upload starts from the first byte.
+        with path.open("rb") as handle:
+            return client.files.create(file=handle, purpose="batch")
+
+    uploaded = LLM_LIMITER.call(_upload)
+    batch = LLM_LIMITER.call(
+        client.batches.create,
+        input_file_id=uploaded.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h",
+        metadata=metadata or {},
+    )
+    LOGGER.info("Submitted batch %s (%s)", batch.id, path.name)
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, *, poll_interval: float = 30.0):
+    """Poll until the batch reaches a terminal status; raises ``BatchNotFound`` for unknown ids."""
+
+    client = sync_client()
+    while True:
+        try:
+            batch = LLM_LIMITER.call(client.batches.retrieve, batch_id)
+        except NotFoundError as exc:
+            raise BatchNotFound(f"Batch {batch_id} not found") from exc
+        counts = batch.request_counts
+        LOGGER.info(
+            "Batch %s | status=%s | completed=%s | failed=%s | total=%s",
+            batch_id,
+            batch.status,
+            getattr(counts, "completed", "?"),
+            getattr(counts, "failed", "?"),
+            getattr(counts, "total", "?"),
+        )
+        if batch.status in TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def response_output_text(body: dict) -> str:
+    """Concatenate the ``output_text`` parts of a raw Responses API body."""
+
+    if body.get("output_text"):
+        return body["output_text"]
+    parts = []
+    for item in body.get("output", []):
+        if item.get("type") != "message":
+            continue
+        for content in item.get("content", []):
+            if content.get("type") == "output_text":
+                parts.append(content.get("text", ""))
+    return "".join(parts)
+
+
+def _read_file(file_id: str | None) -> List[dict]:
+    if not file_id:
+        return []
+    client = sync_client()
+    text = LLM_LIMITER.call(client.files.content, file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def collect_results(batch) -> BatchResults:
+    """Split a finished batch into per-request output text and errors."""
+
+    results = BatchResults(status=batch.status)
+    for line in _read_file(batch.output_file_id) + _read_file(batch.error_file_id):
+        custom_id = line.get("custom_id", "")
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body", {}).get("error") or response
+            results.errors[custom_id] = json.dumps(error) if not isinstance(error, str) else error
+            continue
+        results.outputs[custom_id] = response_output_text(response.get("body", {}))
+    return results
+
+
+__all__ = [
+    "BATCH_ENDPOINT",
+    "BatchNotFound",
+    "BatchResults",
+    "build_request_line",
+    "write_batch_file",
+    "submit_batch",
+    "wait_for_batch",
+    "response_output_text",
+    "collect_results",
+]
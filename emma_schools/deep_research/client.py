@@ -2,17 +2,118 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from typing import List
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
 
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    OpenAI,
+    RateLimitError,
+)
 
-from emma_schools.deep_research.search import build_queries, gather_sources
+from emma_schools.core import metrics as run_metrics
+from emma_schools.core.cache import CacheStore
+from emma_schools.core.ratelimit import NO_RETRY, Backoff, RateLimiter, RetryDecision, parse_retry_after
+from emma_schools.core.paths import cache_file
+from emma_schools.deep_research.packing import DEFAULT_TOKEN_BUDGET, pack_sources
+from emma_schools.deep_research.search import (
+    DEFAULT_MAX_WORKERS,
+    build_queries,
+    gather_sources,
+)
 from emma_schools.deep_research.prompts import DIMENSION_FOCUS
 
 LOGGER = logging.getLogger(__name__)
 
+RESPONSE_CACHE_MODES = ("use", "off", "only", "refresh")
+RESPONSE_CACHE = CacheStore(
+    "Response",
+    path=cache_file("responses"),
+    ttl=None,
+    max_bytes=int(os.getenv("EMMA_RESPONSE_CACHE_MAX_MB", "512")) * 1024 * 1024,
+)
+_response_cache_only = False
+
+# Longest silence tolerated between streamed events before a generation is abandoned.
+DEFAULT_STALL_TIMEOUT = float(os.getenv("EMMA_STALL_TIMEOUT", "90"))
+
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("EMMA_LLM_RPM", "500"))
+LLM_MAX_CONCURRENCY = int(os.getenv("EMMA_LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_ATTEMPTS = int(os.getenv("EMMA_LLM_MAX_ATTEMPTS", "6"))
+
+
+@dataclass(slots=True)
+class ChatMetrics:
+    model: str
+    streamed: bool
+    total_seconds: float
+    time_to_first_token: float | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+
+
+class GenerationStalled(TimeoutError):
+    """Raised when a streamed generation stops producing events."""
+
+
+class ResponseCacheMiss(LookupError):
+    """Raised in cache-only mode when no stored response matches a request."""
+
+
+def _retry_after(exc: APIStatusError) -> float | None:
+    headers = exc.response.headers
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+    return parse_retry_after(headers.get("retry-after"))
+
+
+def _retry_decision(exc: BaseException) -> RetryDecision:
+    """Retry throttling, server errors and dropped connections; nothing else."""
+
+    if isinstance(exc, RateLimitError):
+        return RetryDecision(retry=True, throttled=True, retry_after=_retry_after(exc))
+    if isinstance(exc, APIStatusError) and (exc.status_code >= 500 or exc.status_code in (408, 409)):
+        return RetryDecision(retry=True, retry_after=_retry_after(exc))
+    if isinstance(exc, APIConnectionError):
+        return RetryDecision(retry=True)
+    return NO_RETRY
+
+
+# Shared by every OpenAI call in the process. The SDK's own retries are turned
+# off on the clients below so that attempts are not multiplied.
+LLM_LIMITER = RateLimiter(
+    "llm",
+    rate=LLM_REQUESTS_PER_MINUTE / 60,
+    burst=max(1.0, LLM_MAX_CONCURRENCY),
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    backoff=Backoff(attempts=LLM_MAX_ATTEMPTS),
+    classify=_retry_decision,
+)
+
+_ClientKey = Tuple[str, str | None]
+
+_clients: Dict[_ClientKey, OpenAI] = {}
+_clients_lock = threading.Lock()
+# httpx async pools are bound to the loop that opened them, so async clients
+# are shared per event loop rather than per process.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
 
 def _get_api_key(env_var: str, fallback: str | None = None) -> str:
     key = os.getenv(env_var)
@@ -28,25 +129,29 @@ def _get_api_key(env_var: str, fallback: str | None = None) -> str:
 
 
 def _client_for_key(env_var: str, fallback: str | None = None) -> OpenAI:
-    api_key = _get_api_key(env_var, fallback)
-    return OpenAI(api_key=api_key)
-
-
-def _format_sources_for_prompt(sources) -> str:
-    blocks = []
-    for idx, source in enumerate(sources, start=1):
-        extract = source.content[:1800]
-        block = [
-            f"[Source {idx}] reliability={source.reliability} accessed={source.retrieved_at}",
-            f"Title: {source.title}",
-            f"URL: {source.url}",
-            f"Query: {source.query}",
-        ]
-        if source.snippet:
-            block.append(f"Snippet: {source.snippet}")
-        block.append(f"Extract:\n{extract}")
-        blocks.append("\n".join(block))
-    return "\n\n".join(blocks)
+    """Return the process-wide client for a key, creating it on first use."""
+    with _clients_lock:
+        client = _clients.get((env_var, fallback))
+        if client is None:
+            client = OpenAI(api_key=_get_api_key(env_var, fallback), max_retries=0)
+            _clients[(env_var, fallback)] = client
+        return client
+
+
+def sync_client() -> OpenAI:
+    """Process-wide client for ``OPENAI_API_KEY``, for calls made outside the chat helpers."""
+    return _client_for_key("OPENAI_API_KEY")
+
+
+def _async_client_for_key(env_var: str, fallback: str | None = None) -> AsyncOpenAI:
+    """Return the async client shared by every coroutine on the running loop."""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get((env_var, fallback))
+    if client is None:
+        client = AsyncOpenAI(api_key=_get_api_key(env_var, fallback), max_retries=0)
+        clients[(env_var, fallback)] = client
+    return client
 
 
 def run_deep_research(
@@ -57,6 +162,8 @@ def run_deep_research(
     timeout: int = 600,
     school_name: str | None = None,
     dimension: str | None = None,
+    search_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
 ) -> str:
     """Perform a multi-step open-web research pass using GPT orchestration."""
 
@@ -70,6 +177,7 @@ def run_deep_research(
         queries,
         per_query=2,
         total_limit=max(6, max_queries),
+        max_workers=search_workers,
     )
     LOGGER.info(
         "Research run | school=%s | dimension=%s | queries=%s | sources=%s",
@@ -92,7 +200,17 @@ def run_deep_research(
         ]
         return run_chat_completion(messages, model=os.getenv("OPENAI_DEEP_RESEARCH_MODEL"), timeout=timeout)
 
-    source_block = _format_sources_for_prompt(sources)
+    packed = pack_sources(sources, token_budget=token_budget)
+    LOGGER.info(
+        "Packed sources | school=%s | kept=%s/%s | duplicates=%s | tokens=%s | saved=%s",
+        school,
+        len(packed.sources),
+        len(sources),
+        packed.duplicates,
+        packed.tokens,
+        packed.tokens_saved,
+    )
+    source_block = packed.text
     reliability_hint = (
         "Reliability codes: 3=official/inspection/government, 2=news or vetted publications, "
         "1=community/forum/social."
@@ -122,22 +240,215 @@ def run_deep_research(
     return run_chat_completion(messages, model=model, timeout=timeout)
 
 
+def set_response_cache_mode(mode: str) -> None:
+    """Select how ``run_chat_completion`` uses the response cache.
+
+    ``use`` reads and writes the cache, ``off`` bypasses it, ``only`` serves
+    stored responses and never calls the API, and ``refresh`` calls the API and
+    overwrites whatever was stored.
+    """
+    global _response_cache_only
+    if mode not in RESPONSE_CACHE_MODES:
+        raise ValueError(f"Unknown response cache mode: {mode}")
+    RESPONSE_CACHE.configure(enabled=mode != "off", refresh=mode == "refresh")
+    _response_cache_only = mode == "only"
+
+
+def _response_cache_key(kwargs: dict) -> str:
+    # The timeout changes how long we wait, not what the model returns.
+    material = {key: value for key, value in kwargs.items() if key != "timeout"}
+    payload = json.dumps(material, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached_response(key: str) -> str | None:
+    if not RESPONSE_CACHE.enabled:
+        return None
+    entry = RESPONSE_CACHE.lookup(key)
+    RESPONSE_CACHE.record(hit=entry is not None)
+    if entry is not None:
+        LOGGER.debug("Response cache hit %s", key[:12])
+        return entry.value["output_text"]
+    if _response_cache_only:
+        raise ResponseCacheMiss(f"No cached response for request {key[:12]} (cache-only mode)")
+    return None
+
+
+def _store_response(key: str, kwargs: dict, output_text: str) -> None:
+    cache = RESPONSE_CACHE.cache
+    if cache is not None:
+        cache.set(key, {"model": kwargs["model"], "output_text": output_text})
+
+
+def resolve_chat_model(model: str | None = None) -> str:
+    """Return the model ``run_chat_completion`` will use for ``model``."""
+    return model or os.getenv("OPENAI_DEFAULT_MODEL", "gpt-4o-mini")
+
+
+def _request_kwargs(messages: List[dict], model: str | None, timeout: int | None) -> dict:
+    resolved_model = resolve_chat_model(model)
+    LOGGER.debug("Chat completion | model=%s | messages=%s", resolved_model, len(messages))
+    kwargs = {"model": resolved_model, "input": messages}
+    if timeout:
+        kwargs["timeout"] = timeout
+    return kwargs
+
+
+def _log_metrics(metrics: ChatMetrics) -> None:
+    _count_tokens(metrics.input_tokens, metrics.output_tokens)
+    LOGGER.info(
+        "Chat completion done | model=%s | streamed=%s | ttft=%s | total=%.2fs "
+        "| tokens_in=%s | tokens_out=%s",
+        metrics.model,
+        metrics.streamed,
+        f"{metrics.time_to_first_token:.2f}s" if metrics.time_to_first_token is not None else "-",
+        metrics.total_seconds,
+        metrics.input_tokens,
+        metrics.output_tokens,
+    )
+
+
+def _count_tokens(input_tokens: int | None, output_tokens: int | None) -> None:
+    run_metrics.incr("llm.requests")
+    run_metrics.incr("llm.input_tokens", input_tokens or 0)
+    run_metrics.incr("llm.output_tokens", output_tokens or 0)
+
+
+def _usage_counts(usage) -> Tuple[int | None, int | None]:
+    if usage is None:
+        return None, None
+    return getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None)
+
+
+def _stream_completion(
+    client: OpenAI,
+    kwargs: dict,
+    *,
+    timeout: int | None,
+    stall_timeout: float,
+    partial_path: Path | None,
+) -> Tuple[str, ChatMetrics]:
+    """Consume a streamed response, appending deltas to ``partial_path`` as they arrive.
+
+    The per-read HTTP timeout is set to ``stall_timeout`` so a silent
+    connection fails fast; ``timeout`` still bounds the whole generation. The
+    partial file only shows progress: it is removed once the stream ends,
+    whether it completed or failed.
+    """
+
+    started = time.monotonic()
+    metrics = ChatMetrics(model=kwargs["model"], streamed=True, total_seconds=0.0)
+    request = {**kwargs, "stream": True, "timeout": stall_timeout}
+    handle = partial_path.open("w", encoding="utf-8") if partial_path else None
+    chunks: List[str] = []
+    try:
+        for event in client.responses.create(**request):
+            elapsed = time.monotonic() - started
+            if timeout and elapsed > timeout:
+                raise GenerationStalled(f"Generation exceeded {timeout}s")
+            if event.type == "response.output_text.delta":
+                if metrics.time_to_first_token is None:
+                    metrics.time_to_first_token = elapsed
+                chunks.append(event.delta)
+                if handle:
+                    handle.write(event.delta)
+                    handle.flush()
+            elif event.type == "response.completed":
+                metrics.input_tokens, metrics.output_tokens = _usage_counts(event.response.usage)
+            elif event.type in ("response.failed", "response.incomplete", "error"):
+                raise RuntimeError(f"Streamed generation ended with {event.type}")
+    except APITimeoutError as exc:
+        raise GenerationStalled(f"No streamed events for {stall_timeout}s") from exc
+    finally:
+        if handle:
+            handle.close()
+        if partial_path:
+            partial_path.unlink(missing_ok=True)
+
+    metrics.total_seconds = time.monotonic() - started
+    return "".join(chunks), metrics
+
+
+@run_metrics.timed("run_chat_completion")
 def run_chat_completion(
     messages: List[dict],
     *,
     model: str | None = None,
     timeout: int | None = None,
+    stream: bool = False,
+    partial_path: Path | None = None,
+    stall_timeout: float = DEFAULT_STALL_TIMEOUT,
 ) -> str:
-    """Call the standard GPT chat endpoint using the Responses API."""
+    """Call the standard GPT chat endpoint using the Responses API.
+
+    With ``stream=True`` events are consumed as they arrive and a generation
+    that goes quiet for ``stall_timeout`` seconds raises ``GenerationStalled``.
+    If ``partial_path`` is given the output is appended there while it streams
+    and the file is removed afterwards; writing the result is up to the caller.
+    """
+
+    kwargs = _request_kwargs(messages, model, timeout)
+    key = _response_cache_key(kwargs)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
 
     client = _client_for_key("OPENAI_API_KEY")
-    resolved_model = model or os.getenv("OPENAI_DEFAULT_MODEL", "gpt-4o-mini")
-    LOGGER.debug("Chat completion | model=%s | messages=%s", resolved_model, len(messages))
-    kwargs = {"model": resolved_model, "input": messages}
-    if timeout:
-        kwargs["timeout"] = timeout
-    response = client.responses.create(**kwargs)
+    if stream:
+        text, metrics = LLM_LIMITER.call(
+            _stream_completion,
+            client,
+            kwargs,
+            timeout=timeout,
+            stall_timeout=stall_timeout,
+            partial_path=partial_path,
+        )
+    else:
+        started = time.monotonic()
+        response = LLM_LIMITER.call(client.responses.create, **kwargs)
+        text = response.output_text
+        metrics = ChatMetrics(
+            model=kwargs["model"], streamed=False, total_seconds=time.monotonic() - started
+        )
+        metrics.input_tokens, metrics.output_tokens = _usage_counts(getattr(response, "usage", None))
+    _log_metrics(metrics)
+    _store_response(key, kwargs, text)
+    return text
+
+
+async def run_chat_completion_async(
+    messages: List[dict],
+    *,
+    model: str | None = None,
+    timeout: int | None = None,
+) -> str:
+    """Async counterpart of ``run_chat_completion`` built on ``AsyncOpenAI``."""
+
+    kwargs = _request_kwargs(messages, model, timeout)
+    key = _response_cache_key(kwargs)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+
+    client = _async_client_for_key("OPENAI_API_KEY")
+    with run_metrics.span("run_chat_completion"):
+        response = await LLM_LIMITER.call_async(client.responses.create, **kwargs)
+    _count_tokens(*_usage_counts(getattr(response, "usage", None)))
+    _store_response(key, kwargs, response.output_text)
     return response.output_text
 
 
-__all__ = ["run_deep_research", "run_chat_completion"]
+__all__ = [
+    "LLM_LIMITER",
+    "RESPONSE_CACHE",
+    "RESPONSE_CACHE_MODES",
+    "ChatMetrics",
+    "GenerationStalled",
+    "ResponseCacheMiss",
+    "resolve_chat_model",
+    "run_deep_research",
+    "run_chat_completion",
+    "run_chat_completion_async",
+    "set_response_cache_mode",
+    "sync_client",
+]
@@ -0,0 +1,138 @@
+"""Pack research sources into a prompt under a token budget."""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Sequence, Set
+
+from emma_schools.deep_research.search import Source
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("EMMA_PROMPT_TOKEN_BUDGET", "6000"))
+EXTRACT_CHARS = 1800
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = 0.5
+# Rough English average for OpenAI tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(slots=True)
+class PackedSources:
+    text: str
+    sources: List[Source]
+    tokens: int
+    tokens_saved: int
+    duplicates: int = 0
+    dropped: int = 0
+
+
+@dataclass(slots=True)
+class _Candidate:
+    index: int
+    source: Source
+    shingles: Set[int]
+    also: List[str] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _shingles(text: str) -> Set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i : i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _similarity(left: Set[int], right: Set[int]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _format_block(number: int, source: Source, also: Sequence[str] = ()) -> str:
+    block = [
+        f"[Source {number}] reliability={source.reliability} accessed={source.retrieved_at}",
+        f"Title: {source.title}",
+        f"URL: {source.url}",
+        f"Query: {source.query}",
+    ]
+    if also:
+        block.append(f"Also reported by: {', '.join(also)}")
+    if source.snippet:
+        block.append(f"Snippet: {source.snippet}")
+    block.append(f"Extract:\n{source.content[:EXTRACT_CHARS]}")
+    return "\n".join(block)
+
+
+def pack_sources(
+    sources: Sequence[Source],
+    *,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> PackedSources:
+    """Select, de-duplicate and format sources so the block fits ``token_budget``.
+
+    Sources are considered in order of reliability (highest first, ties in
+    original order). An extract that shares at least ``DUPLICATE_THRESHOLD`` of
+    its word shingles with an already selected one is merged into it as an
+    "Also reported by" URL. Selected sources are emitted in their original
+    order; the first selected source is always kept even if it alone exceeds
+    the budget.
+    """
+
+    baseline = estimate_tokens(
+        "\n\n".join(_format_block(number, source) for number, source in enumerate(sources, start=1))
+    )
+    order = sorted(range(len(sources)), key=lambda index: (-sources[index].reliability, index))
+    kept: List[_Candidate] = []
+    used = 0
+    duplicates = dropped = 0
+    for index in order:
+        source = sources[index]
+        shingles = _shingles(source.content[:EXTRACT_CHARS] or source.snippet)
+        original = next(
+            (
+                candidate
+                for candidate in kept
+                if _similarity(shingles, candidate.shingles) >= DUPLICATE_THRESHOLD
+            ),
+            None,
+        )
+        if original is not None:
+            original.also.append(source.url)
+            used += estimate_tokens(source.url) + 1
+            duplicates += 1
+            continue
+        cost = estimate_tokens(_format_block(index + 1, source)) + 1
+        if kept and used + cost > token_budget:
+            dropped += 1
+            continue
+        kept.append(_Candidate(index=index, source=source, shingles=shingles))
+        used += cost
+
+    kept.sort(key=lambda candidate: candidate.index)
+    text = "\n\n".join(
+        _format_block(number, candidate.source, candidate.also)
+        for number, candidate in enumerate(kept, start=1)
+    )
+    tokens = estimate_tokens(text)
+    return PackedSources(
+        text=text,
+        sources=[candidate.source for candidate in kept],
+        tokens=tokens,
+        tokens_saved=max(0, baseline - tokens),
+        duplicates=duplicates,
+        dropped=dropped,
+    )
+
+
+__all__ = ["DEFAULT_TOKEN_BUDGET", "PackedSources", "estimate_tokens", "pack_sources"]
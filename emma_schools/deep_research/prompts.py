@@ -111,6 +111,10 @@ RAW_PROMPT_BUILDERS: Dict[str, Callable[[str], str]] = {
 }
 
 
+# Bump whenever evidence_prompt changes so existing evidence files are regenerated.
+EVIDENCE_PROMPT_VERSION = "1"
+
+
 def evidence_prompt(school_name: str, raw_text: str) -> str:
     """Create the synthesis prompt for transforming raw facts into evidence."""
 
@@ -152,5 +156,6 @@ __all__ = [
     "raw_prompt_commute",
     "raw_prompt_reputation",
     "raw_prompt_fit",
+    "EVIDENCE_PROMPT_VERSION",
     "evidence_prompt",
 ]
@@ -2,21 +2,52 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
+import os
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, List
+from html.parser import HTMLParser
+from typing import Callable, Deque, Dict, Iterable, List, Tuple
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import RatelimitException, TimeoutException
+from requests.adapters import HTTPAdapter
+
+from emma_schools.core import metrics
+from emma_schools.core.cache import CacheEntry, CacheStore
+from emma_schools.core.paths import cache_file
+from emma_schools.core.ratelimit import NO_RETRY, Backoff, RateLimiter, RetryDecision
+from emma_schools.deep_research.source_pool import SourcePool, canonical_url
 
 LOGGER = logging.getLogger(__name__)
 
 USER_AGENT = "EmmaSchoolsResearchBot/0.1 (+https://example.com/emma-schools)"
-DEFAULT_HEADERS = {"User-Agent": USER_AGENT}
+DEFAULT_HEADERS = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_DOMAIN = 2
+# Process-wide caps shared by every concurrent research task.
+SEARCH_MAX_WORKERS = int(os.getenv("EMMA_SEARCH_WORKERS", str(DEFAULT_MAX_WORKERS)))
+FETCH_MAX_WORKERS = int(os.getenv("EMMA_FETCH_WORKERS", "16"))
+FETCH_PER_DOMAIN = int(os.getenv("EMMA_FETCH_PER_DOMAIN", str(DEFAULT_PER_DOMAIN)))
+
+PAGE_CACHE_TTL = int(os.getenv("EMMA_PAGE_CACHE_TTL", str(7 * 24 * 3600)))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("EMMA_PAGE_CACHE_MAX_MB", "256")) * 1024 * 1024
+MAX_FETCH_BYTES = int(os.getenv("EMMA_MAX_FETCH_KB", "2048")) * 1024
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_CHUNK_SIZE = 16 * 1024
+_SKIPPED_TAGS = {"script", "style", "noscript"}
+SOURCE_POOL_MAX_ENTRIES = int(os.getenv("EMMA_SOURCE_POOL_MAX", "5000"))
+SEARCH_CACHE_TTL = int(os.getenv("EMMA_SEARCH_CACHE_TTL", str(3 * 24 * 3600)))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("EMMA_SEARCH_CACHE_MAX_MB", "32")) * 1024 * 1024
 
 OFFICIAL_DOMAINS = (
     "gov.uk",
@@ -73,33 +104,341 @@ def classify_reliability(url: str) -> int:
     return 2
 
 
+SEARCH_REQUESTS_PER_SECOND = float(os.getenv("EMMA_SEARCH_RPS", "1"))
+SEARCH_BURST = float(os.getenv("EMMA_SEARCH_BURST", "4"))
+SEARCH_MAX_ATTEMPTS = int(os.getenv("EMMA_SEARCH_MAX_ATTEMPTS", "5"))
+
+
+def _search_retry_decision(exc: BaseException) -> RetryDecision:
+    if isinstance(exc, RatelimitException):
+        return RetryDecision(retry=True, throttled=True)
+    if isinstance(exc, TimeoutException):
+        return RetryDecision(retry=True)
+    return NO_RETRY
+
+
+# DuckDuckGo throttles by client, so every search in the process shares one limiter.
+SEARCH_LIMITER = RateLimiter(
+    "search",
+    rate=SEARCH_REQUESTS_PER_SECOND,
+    burst=SEARCH_BURST,
+    max_concurrency=SEARCH_MAX_WORKERS,
+    backoff=Backoff(attempts=SEARCH_MAX_ATTEMPTS, base=2.0),
+    classify=_search_retry_decision,
+)
+
+PAGE_CACHE = CacheStore(
+    "Page",
+    path=cache_file("pages"),
+    ttl=PAGE_CACHE_TTL,
+    max_bytes=PAGE_CACHE_MAX_BYTES,
+    enabled=os.getenv("EMMA_PAGE_CACHE", "1") != "0",
+)
+SEARCH_CACHE = CacheStore(
+    "Search",
+    path=cache_file("search"),
+    ttl=SEARCH_CACHE_TTL,
+    max_bytes=SEARCH_CACHE_MAX_BYTES,
+    enabled=os.getenv("EMMA_SEARCH_CACHE", "1") != "0",
+)
+
+# Shared by every school in the process; persists pages and redirects via PAGE_CACHE.
+SOURCE_POOL = SourcePool(PAGE_CACHE, max_entries=SOURCE_POOL_MAX_ENTRIES)
+
+
+_session_lock = threading.Lock()
+_shared_session: requests.Session | None = None
+
+
+def _session() -> requests.Session:
+    """Process-wide keep-alive session shared by every fetch thread.
+
+    Only plain GETs go through it and urllib3's connection pools are
+    thread-safe, so connections are reused across research tasks. Each host
+    keeps up to ``FETCH_PER_DOMAIN`` connections, matching the per-host cap.
+    """
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=64, pool_maxsize=max(1, FETCH_PER_DOMAIN))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _shared_session = session
+        return _shared_session
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text as HTML is fed in, stopping once enough is held."""
+
+    def __init__(self, max_chars: int, *, markup: bool = True) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.markup = markup
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self._length >= self.max_chars
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth or self.done:
+            return
+        words = data.split()
+        if words:
+            chunk = " ".join(words)
+            self._parts.append(chunk)
+            self._length += len(chunk) + 1
+
+    def feed_text(self, data: str) -> None:
+        if self.markup:
+            self.feed(data)
+        else:
+            self.handle_data(data)
+
+    def text(self) -> str:
+        if self.markup:
+            self.close()
+        return " ".join(self._parts)[: self.max_chars]
+
+
+def _read_text(response: requests.Response, max_chars: int) -> str:
+    """Stream a response body into text, stopping at ``max_chars`` or ``MAX_FETCH_BYTES``."""
+
+    content_type = response.headers.get("Content-Type", "text/html").lower()
+    media_type = content_type.split(";")[0].strip()
+    if media_type not in TEXT_CONTENT_TYPES:
+        LOGGER.debug("Skipping %s (content type %s)", response.url, media_type or "unknown")
+        return ""
+
+    encoding = response.encoding if "charset" in content_type else "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    extractor = _TextExtractor(max_chars, markup=media_type != "text/plain")
+    received = 0
+    parse_seconds = 0.0
+    try:
+        for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+            received += len(chunk)
+            started = time.perf_counter()
+            extractor.feed_text(decoder.decode(chunk))
+            parse_seconds += time.perf_counter() - started
+            if extractor.done:
+                break
+            if received >= MAX_FETCH_BYTES:
+                LOGGER.debug("Stopped reading %s at %s bytes", response.url, received)
+                break
+    finally:
+        metrics.incr("fetch.bytes", received)
+        metrics.observe("parse_html", parse_seconds)
+    return extractor.text()
+
+
+def _cached_text(entry: CacheEntry, max_chars: int) -> str | None:
+    text = entry.value.get("text", "")
+    stored_limit = entry.value.get("max_chars", 0)
+    # A shorter extract only satisfies larger requests if it was not truncated.
+    if stored_limit >= max_chars or len(text) < stored_limit:
+        return text[:max_chars]
+    return None
+
+
 def fetch_url_text(url: str, *, timeout: int = 12, max_chars: int = 4000) -> str:
+    """Text of ``url``, fetched at most once per run across all schools (see ``SOURCE_POOL``)."""
+    return SOURCE_POOL.get(
+        url, max_chars, lambda key: _load_page(url, key, timeout=timeout, max_chars=max_chars)
+    )
+
+
+@metrics.timed("fetch_url_text")
+def _load_page(url: str, key: str, *, timeout: int, max_chars: int) -> str:
+    entry = PAGE_CACHE.lookup(key)
+    cached = _cached_text(entry, max_chars) if entry else None
+    if cached is not None and PAGE_CACHE.is_fresh(entry):
+        LOGGER.debug("Page cache hit %s", url)
+        PAGE_CACHE.record(hit=True)
+        SOURCE_POOL.record_load(fetched=False)
+        return cached
+
+    SOURCE_POOL.record_load(fetched=True)
+
+    headers = {}
+    if cached is not None:
+        if entry.value.get("etag"):
+            headers["If-None-Match"] = entry.value["etag"]
+        if entry.value.get("last_modified"):
+            headers["If-Modified-Since"] = entry.value["last_modified"]
+
     try:
-        response = requests.get(url, timeout=timeout, headers=DEFAULT_HEADERS)
-        response.raise_for_status()
+        with _session().get(url, timeout=timeout, headers=headers, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                LOGGER.debug("Page cache revalidated %s", url)
+                PAGE_CACHE.record(hit=True)
+                PAGE_CACHE.cache.touch(key)
+                return cached
+            response.raise_for_status()
+            text = _read_text(response, max_chars)
+            final_key = SOURCE_POOL.record_redirect(key, response.url)
     except Exception as exc:
         LOGGER.debug("Failed to fetch %s (%s)", url, exc)
-        return ""
+        metrics.incr("fetch_url_text.failures")
+        return cached or ""
+
+    PAGE_CACHE.record(hit=False)
+    cache = PAGE_CACHE.cache
+    if cache is not None:
+        cache.set(
+            final_key,
+            {
+                "url": url,
+                "text": text,
+                "max_chars": max_chars,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            },
+        )
+    return text
+
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = " ".join(soup.get_text(separator=" ").split())
-    return text[:max_chars]
+def _search_key(query: str, max_results: int) -> str:
+    normalized = " ".join(query.lower().split())
+    return f"{max_results}|{normalized}"
 
 
+@metrics.timed("ddg_search")
 def ddg_search(query: str, max_results: int = 4) -> List[dict]:
-    with DDGS() as ddgs:
-        return list(ddgs.text(query, max_results=max_results))
+    key = _search_key(query, max_results)
+    entry = SEARCH_CACHE.lookup(key)
+    if entry is not None and SEARCH_CACHE.is_fresh(entry):
+        SEARCH_CACHE.record(hit=True)
+        return entry.value["results"]
 
+    SEARCH_CACHE.record(hit=False)
 
-def gather_sources(
-    queries: Iterable[str],
+    def _query() -> List[dict]:
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+    results = SEARCH_LIMITER.call(_query)
+    cache = SEARCH_CACHE.cache
+    # Empty result sets are usually throttling, so they are not worth keeping.
+    if cache is not None and results:
+        cache.set(key, {"query": query, "results": results})
+    return results
+
+
+def _make_source(result: dict, url: str, content: str, query: str) -> Source | None:
+    title = result.get("title") or url
+    snippet = result.get("body") or ""
+    if not content and not snippet:
+        return None
+    return Source(
+        title=title.strip(),
+        url=url,
+        snippet=snippet.strip(),
+        content=content.strip() or snippet.strip(),
+        query=query,
+        reliability=classify_reliability(url),
+        retrieved_at=datetime.now(timezone.utc).date().isoformat(),
+    )
+
+
+def _search_all(queries: List[str], per_query: int) -> List[List[dict]]:
+    def _search(query: str) -> List[dict]:
+        try:
+            return ddg_search(query, max_results=per_query)
+        except Exception as exc:
+            LOGGER.warning("Search failed for '%s': %s", query, exc)
+            return []
+
+    return list(_SEARCH_POOL.map(_search, queries))
+
+
+def _host_key(url: str) -> str:
+    return urlparse(canonical_url(url)).netloc
+
+
+class _HostScheduler:
+    """Runs fetches on a pool with at most ``per_host`` in flight per host.
+
+    ``www.`` and the bare host count as one. A fetch for a busy host waits in
+    that host's queue rather than on a pool thread, so a slow or throttled
+    host never holds threads that fetches for other hosts could use.
+    """
+
+    def __init__(self, pool: ThreadPoolExecutor, per_host: int) -> None:
+        self._pool = pool
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {}
+        self._queued: Dict[str, Deque[Tuple[Future, Callable[[], str]]]] = {}
+
+    def submit(self, url: str, fetch: Callable[[], str]) -> Future:
+        host = _host_key(url)
+        future: Future = Future()
+        with self._lock:
+            active = self._active.get(host, 0)
+            if active >= self._per_host:
+                self._queued.setdefault(host, deque()).append((future, fetch))
+                return future
+            self._active[host] = active + 1
+        self._pool.submit(self._run, host, future, fetch)
+        return future
+
+    def _run(self, host: str, future: Future, fetch: Callable[[], str]) -> None:
+        try:
+            # False when the caller cancelled the fetch while it was queued.
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fetch())
+                except BaseException as exc:
+                    future.set_exception(exc)
+        finally:
+            self._release(host)
+
+    def _release(self, host: str) -> None:
+        """Hand the finished fetch's slot to the host's next queued fetch, if any."""
+
+        with self._lock:
+            queue = self._queued.get(host)
+            if not queue:
+                self._queued.pop(host, None)
+                self._active[host] -= 1
+                if not self._active[host]:
+                    del self._active[host]
+                return
+            future, fetch = queue.popleft()
+        self._pool.submit(self._run, host, future, fetch)
+
+
+# Shared across calls so that concurrent research tasks together stay within
+# SEARCH_MAX_WORKERS searches, FETCH_MAX_WORKERS fetches and FETCH_PER_DOMAIN
+# fetches per host. Threads are only started when first needed.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="emma-search")
+_FETCH_POOL = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="emma-fetch")
+_FETCHES = _HostScheduler(_FETCH_POOL, FETCH_PER_DOMAIN)
+
+
+def _gather_sequential(
+    queries: List[str],
     *,
-    per_query: int = 3,
-    total_limit: int = 12,
-    fetch_timeout: int = 12,
-    max_chars: int = 4000,
+    per_query: int,
+    total_limit: int,
+    fetch_timeout: int,
+    max_chars: int,
 ) -> List[Source]:
     seen_urls: set[str] = set()
     collected: List[Source] = []
@@ -111,31 +450,111 @@ def gather_sources(
             continue
         for result in results:
             url = result.get("href") or result.get("url")
-            if not url or url in seen_urls:
+            if not url:
                 continue
-            seen_urls.add(url)
-            title = result.get("title") or url
-            snippet = result.get("body") or ""
+            key = SOURCE_POOL.key(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
             content = fetch_url_text(url, timeout=fetch_timeout, max_chars=max_chars)
-            if not content and not snippet:
+            source = _make_source(result, url, content, query)
+            if source is None:
                 continue
-            reliability = classify_reliability(url)
-            collected.append(
-                Source(
-                    title=title.strip(),
-                    url=url,
-                    snippet=snippet.strip(),
-                    content=content.strip() or snippet.strip(),
-                    query=query,
-                    reliability=reliability,
-                    retrieved_at=datetime.now(timezone.utc).date().isoformat(),
-                )
-            )
+            collected.append(source)
             if len(collected) >= total_limit:
                 return collected
     return collected
 
 
+def _gather_concurrent(
+    queries: List[str],
+    *,
+    per_query: int,
+    total_limit: int,
+    fetch_timeout: int,
+    max_chars: int,
+) -> List[Source]:
+    results_per_query = _search_all(queries, per_query)
+
+    # Dedupe in query order so the candidate list matches the sequential walk.
+    seen_urls: set[str] = set()
+    candidates: List[Tuple[str, dict, str]] = []
+    for query, results in zip(queries, results_per_query):
+        for result in results:
+            url = result.get("href") or result.get("url")
+            if not url:
+                continue
+            key = SOURCE_POOL.key(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+            candidates.append((query, result, url))
+
+    def _fetch(url: str) -> Callable[[], str]:
+        return lambda: fetch_url_text(url, timeout=fetch_timeout, max_chars=max_chars)
+
+    collected: List[Source] = []
+    futures = [_FETCHES.submit(url, _fetch(url)) for _, _, url in candidates]
+    try:
+        # Consume in candidate order so the output is deterministic regardless
+        # of which fetch finishes first.
+        for (query, result, url), future in zip(candidates, futures):
+            source = _make_source(result, url, future.result(), query)
+            if source is None:
+                continue
+            collected.append(source)
+            if len(collected) >= total_limit:
+                break
+    finally:
+        # Drop queued fetches whose results can no longer be used.
+        for future in futures:
+            future.cancel()
+    return collected
+
+
+def gather_sources(
+    queries: Iterable[str],
+    *,
+    per_query: int = 3,
+    total_limit: int = 12,
+    fetch_timeout: int = 12,
+    max_chars: int = 4000,
+    max_workers: int = 1,
+) -> List[Source]:
+    """Search every query and fetch the linked pages.
+
+    With ``max_workers > 1`` searches and fetches run on the process-wide
+    pools, so all concurrent callers together stay within
+    ``SEARCH_MAX_WORKERS`` searches, ``FETCH_MAX_WORKERS`` fetches and
+    ``FETCH_PER_DOMAIN`` fetches per host. Sources are returned in the same
+    order as the sequential walk (query order, then result order) so prompts
+    built from them stay reproducible.
+    """
+
+    query_list = list(queries)
+    if max_workers <= 1:
+        return _gather_sequential(
+            query_list,
+            per_query=per_query,
+            total_limit=total_limit,
+            fetch_timeout=fetch_timeout,
+            max_chars=max_chars,
+        )
+    return _gather_concurrent(
+        query_list,
+        per_query=per_query,
+        total_limit=total_limit,
+        fetch_timeout=fetch_timeout,
+        max_chars=max_chars,
+    )
+
+
+def log_cache_stats() -> None:
+    SEARCH_CACHE.log_stats()
+    PAGE_CACHE.log_stats()
+    SOURCE_POOL.log_stats()
+
+
 def build_queries(school_name: str, dimension: str, focus: str, max_queries: int) -> List[str]:
     base_terms = re.split(r",|/|;|\\band\\b", focus, flags=re.IGNORECASE)
     queries = []
@@ -157,4 +576,21 @@ def build_queries(school_name: str, dimension: str, focus: str, max_queries: int
     return queries[:max_queries]
 
 
-__all__ = ["Source", "gather_sources", "build_queries"]
+__all__ = [
+    "Source",
+    "DEFAULT_MAX_WORKERS",
+    "DEFAULT_PER_DOMAIN",
+    "FETCH_MAX_WORKERS",
+    "FETCH_PER_DOMAIN",
+    "PAGE_CACHE",
+    "SEARCH_CACHE",
+    "SEARCH_LIMITER",
+    "SEARCH_MAX_WORKERS",
+    "SOURCE_POOL",
+    "canonical_url",
+    "fetch_url_text",
+    "ddg_search",
+    "log_cache_stats",
+    "gather_sources",
+    "build_queries",
+]
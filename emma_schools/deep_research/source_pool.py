@@ -0,0 +1,198 @@
+"""Page texts shared across schools, keyed by canonical URL.
+
+Schools in the same area keep finding the same pages (council admissions
+pages, league tables, local news round-ups). ``SourcePool`` makes sure each of
+those is fetched once per run: the first request loads the page (from the
+page cache or the network), requests that arrive while that load is in flight
+wait for it, and later requests are answered from memory. Redirects seen while
+fetching are recorded, in memory and in the page cache, so the original and
+redirected URLs share one entry in this run and in later ones.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlparse, urlunparse
+
+from emma_schools.core import metrics
+from emma_schools.core.cache import CacheStore
+
+LOGGER = logging.getLogger(__name__)
+
+TRACKING_PARAMS = frozenset(
+    {"gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl"}
+)
+TRACKING_PREFIXES = ("utm_",)
+MAX_REDIRECT_HOPS = 5
+_REDIRECT_PREFIX = "redirect|"
+
+
+def _is_tracking(param: str) -> bool:
+    name = param.split("=", 1)[0].lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """Normalise a URL for use as a cache and source-pool key.
+
+    http and https are treated as the same page, as are hosts with and without
+    ``www.``; default ports, fragments, tracking parameters (``utm_*``,
+    ``gclid``, ``fbclid`` ...) and trailing slashes are dropped. The remaining
+    query string is kept as-is. Recorded redirects are followed by
+    ``SourcePool.key``, not here.
+    """
+
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if scheme in ("http", "https"):
+        if netloc.endswith((":80", ":443")):
+            netloc = netloc.rsplit(":", 1)[0]
+        scheme = "https"
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    path = parsed.path.rstrip("/") or "/"
+    query = "&".join(param for param in parsed.query.split("&") if param and not _is_tracking(param))
+    return urlunparse((scheme, netloc, path, parsed.params, query, ""))
+
+
+class SourcePool:
+    """In-run pool of fetched page texts in front of a persistent page cache.
+
+    ``max_entries`` bounds the texts kept in memory (least recently used go
+    first); redirects are small and always kept.
+    """
+
+    def __init__(self, store: CacheStore, *, max_entries: int = 5000) -> None:
+        self.store = store
+        self.max_entries = max_entries
+        self.requests = 0
+        self.shared = 0
+        self.fetched = 0
+        self.cached = 0
+        self._lock = threading.Lock()
+        self._texts: OrderedDict[str, Tuple[int, str]] = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._redirects: Dict[str, str] = {}
+
+    def _redirect_target(self, key: str) -> str | None:
+        with self._lock:
+            target = self._redirects.get(key)
+        if target is not None:
+            return target
+        entry = self.store.lookup(_REDIRECT_PREFIX + key)
+        if entry is None:
+            return None
+        target = entry.value["target"]
+        with self._lock:
+            self._redirects[key] = target
+        return target
+
+    def key(self, url: str) -> str:
+        """Canonical URL of ``url`` after following any recorded redirects."""
+
+        key = canonical_url(url)
+        for _ in range(MAX_REDIRECT_HOPS):
+            target = self._redirect_target(key)
+            if target is None or target == key:
+                break
+            key = target
+        return key
+
+    def record_redirect(self, key: str, final_url: str) -> str:
+        """Remember that ``key`` redirects to ``final_url``; returns the final key."""
+
+        target = canonical_url(final_url)
+        if target == key:
+            return key
+        with self._lock:
+            self._redirects[key] = target
+        cache = self.store.cache
+        if cache is not None:
+            cache.set(_REDIRECT_PREFIX + key, {"target": target})
+        LOGGER.debug("Recorded redirect %s -> %s", key, target)
+        return target
+
+    def record_load(self, *, fetched: bool) -> None:
+        """Count how a pool miss was served: from the network or the page cache."""
+
+        with self._lock:
+            if fetched:
+                self.fetched += 1
+            else:
+                self.cached += 1
+        metrics.incr("sources.fetched" if fetched else "sources.cached")
+
+    def _lookup(self, key: str, max_chars: int) -> str | None:
+        item = self._texts.get(key)
+        if item is None:
+            return None
+        stored_limit, text = item
+        # As in the page cache, a shorter extract only serves larger requests if it was not truncated.
+        if stored_limit < max_chars and len(text) >= stored_limit:
+            return None
+        self._texts.move_to_end(key)
+        return text[:max_chars]
+
+    def _store(self, keys: Tuple[str, ...], max_chars: int, text: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._texts[key] = (max_chars, text)
+                self._texts.move_to_end(key)
+            while len(self._texts) > self.max_entries:
+                self._texts.popitem(last=False)
+
+    def _mark_shared(self) -> None:
+        self.shared += 1
+        metrics.incr("sources.shared")
+
+    def get(self, url: str, max_chars: int, load: Callable[[str], str]) -> str:
+        """Return the text of ``url``, calling ``load(key)`` only if no one else has."""
+
+        key = self.key(url)
+        with self._lock:
+            self.requests += 1
+            text = self._lookup(key, max_chars)
+            if text is not None:
+                self._mark_shared()
+                return text
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            text = future.result()
+            with self._lock:
+                self._mark_shared()
+            return text[:max_chars]
+
+        text = ""
+        try:
+            text = load(key)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            future.set_result(text)
+        # Failed or empty fetches are not pooled, so a later school can retry them.
+        if text:
+            self._store(tuple({key, self.key(url)}), max_chars, text)
+        return text
+
+    def log_stats(self) -> None:
+        if self.requests:
+            LOGGER.info(
+                "Source pool | requests=%s | fetched=%s | page cache=%s | shared=%s | fetches saved=%s",
+                self.requests,
+                self.fetched,
+                self.cached,
+                self.shared,
+                self.shared + self.cached,
+            )
+
+
+__all__ = ["MAX_REDIRECT_HOPS", "SourcePool", "TRACKING_PARAMS", "canonical_url"]
@@ -0,0 +1,190 @@
+"""Parsed index of the fact records held in the /raw Markdown files.
+
+The Markdown stays the human-readable record; each school also gets a JSONL
+file next to it with one parsed fact per line, so the source log and later
+stages can query facts without re-running regexes over the whole raw file.
+The first line of that file records a digest of the FACTS section the index
+describes and the Dimension Run headers in it; an index whose digest no longer
+matches the Markdown (hand edits, a crash between the two writes) is rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import List, Tuple
+
+from emma_schools.core.files import atomic_write_text
+from emma_schools.core.paths import fact_index_file
+
+FACT_HEADER_RE = re.compile(r"^###\s*Fact ID:\s*(.+?)\s*$", flags=re.MULTILINE)
+RUN_HEADER_RE = re.compile(r"^### Dimension Run:\s*(\S+)\s*—\s*(\S+)\s*$", flags=re.MULTILINE)
+SOURCE_RE = re.compile(r"-\s*Source:\s*(.+)")
+_FIELD_RE = re.compile(r"^\s*-\s*(Category|Tags|Accessed|Reliability):\s*(.*?)\s*$", flags=re.MULTILINE)
+
+
+@dataclass(slots=True)
+class FactRecord:
+    fact_id: str
+    dimension: str
+    run_timestamp: str
+    category: str = ""
+    tags: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    accessed: str = ""
+    reliability: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FactRecord":
+        return cls(**data)
+
+
+@dataclass(slots=True)
+class FactIndex:
+    """The parsed facts of one raw file and the FACTS section they were read from."""
+
+    facts_digest: str
+    runs: List[Tuple[str, str]]  # (dimension, timestamp) per Dimension Run, in file order
+    records: List[FactRecord]
+
+
+def _parse_tags(value: str) -> List[str]:
+    return [tag.strip().strip("\"'") for tag in value.strip("[]").split(",") if tag.strip()]
+
+
+def _parse_reliability(value: str) -> int | None:
+    match = re.search(r"\d", value)
+    return int(match.group(0)) if match else None
+
+
+def _parse_chunk(fact_id: str, chunk: str, dimension: str, run_timestamp: str) -> FactRecord | None:
+    sources = [match.group(1).strip() for match in SOURCE_RE.finditer(chunk) if match.group(1).strip()]
+    if not fact_id and not sources:
+        return None
+    record = FactRecord(fact_id=fact_id, dimension=dimension, run_timestamp=run_timestamp, sources=sources)
+    for match in _FIELD_RE.finditer(chunk):
+        name, value = match.group(1), match.group(2)
+        if name == "Category":
+            record.category = value
+        elif name == "Tags":
+            record.tags = _parse_tags(value)
+        elif name == "Accessed":
+            record.accessed = value
+        elif name == "Reliability":
+            record.reliability = _parse_reliability(value)
+    return record
+
+
+def parse_run_block(text: str, dimension: str, run_timestamp: str) -> List[FactRecord]:
+    """Parse the fact records emitted by a single Dimension Run.
+
+    Source lines that appear before the first ``### Fact ID`` header are kept as
+    a record with an empty ``fact_id`` so the source log never loses them.
+    """
+
+    records: List[FactRecord] = []
+    headers = list(FACT_HEADER_RE.finditer(text))
+    leading = text[: headers[0].start()] if headers else text
+    record = _parse_chunk("", leading, dimension, run_timestamp)
+    if record:
+        records.append(record)
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        record = _parse_chunk(header.group(1), text[header.end() : end], dimension, run_timestamp)
+        if record:
+            records.append(record)
+    return records
+
+
+def parse_facts_section(text: str) -> List[FactRecord]:
+    """Parse every Dimension Run block found in a FACTS section."""
+
+    records: List[FactRecord] = []
+    runs = list(RUN_HEADER_RE.finditer(text))
+    if not runs:
+        return parse_run_block(text, "", "")
+    records.extend(parse_run_block(text[: runs[0].start()], "", ""))
+    for index, run in enumerate(runs):
+        end = runs[index + 1].start() if index + 1 < len(runs) else len(text)
+        records.extend(parse_run_block(text[run.end() : end], run.group(1).lower(), run.group(2)))
+    return records
+
+
+def facts_digest(section: str) -> str:
+    return hashlib.sha256(section.encode("utf-8")).hexdigest()
+
+
+def parse_run_headers(section: str) -> List[Tuple[str, str]]:
+    """(dimension, timestamp) of every Dimension Run header, in file order."""
+
+    return [(match.group(1).lower(), match.group(2)) for match in RUN_HEADER_RE.finditer(section)]
+
+
+def build_index(section: str) -> FactIndex:
+    """Index a FACTS section from scratch."""
+
+    return FactIndex(facts_digest(section), parse_run_headers(section), parse_facts_section(section))
+
+
+def _read_header(line: str) -> Tuple[str, List[Tuple[str, str]]] | None:
+    data = json.loads(line) if line.strip() else {}
+    if "facts_digest" not in data:
+        return None  # an index written before digests were recorded
+    return data["facts_digest"], [tuple(run) for run in data["runs"]]
+
+
+def read_runs(slug: str) -> Tuple[str, List[Tuple[str, str]]] | None:
+    """The digest and Dimension Run headers recorded for a school, without loading the facts."""
+
+    path = fact_index_file(slug)
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as handle:
+        return _read_header(handle.readline())
+
+
+def read_index(slug: str) -> FactIndex | None:
+    path = fact_index_file(slug)
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as handle:
+        header = _read_header(handle.readline())
+        if header is None:
+            return None
+        records = [FactRecord.from_dict(json.loads(line)) for line in handle if line.strip()]
+    return FactIndex(header[0], header[1], records)
+
+
+def write_index(slug: str, index: FactIndex) -> None:
+    header = json.dumps({"facts_digest": index.facts_digest, "runs": index.runs})
+    lines = [header, *(json.dumps(asdict(record), ensure_ascii=False) for record in index.records)]
+    atomic_write_text(fact_index_file(slug), "".join(f"{line}\n" for line in lines))
+
+
+def load_records(slug: str) -> List[FactRecord]:
+    index = read_index(slug)
+    return index.records if index is not None else []
+
+
+def source_list(slug: str) -> List[str]:
+    """Sorted, de-duplicated sources cited across every indexed fact."""
+
+    return sorted({source for record in load_records(slug) for source in record.sources})
+
+
+__all__ = [
+    "FactIndex",
+    "FactRecord",
+    "parse_run_block",
+    "parse_facts_section",
+    "facts_digest",
+    "parse_run_headers",
+    "build_index",
+    "read_index",
+    "read_runs",
+    "write_index",
+    "load_records",
+    "source_list",
+]
@@ -0,0 +1,167 @@
+"""Pipelined raw → evidence → score execution for ``emma full-run``.
+
+Instead of running each stage for every school before starting the next,
+a school's evidence synthesis starts as soon as all of its dimensions have
+been researched, and it is scored straight after. Only the CSV and the
+scoring grid wait for every school.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Sequence
+
+from emma_schools.config import School
+from emma_schools.core import metrics
+from emma_schools.core.journal import RunJournal, output_digest
+from emma_schools.pipelines import grid, raw_facts, scoring, synthesis
+from emma_schools.pipelines.raw_facts import TaskFailure
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PipelineResult:
+    rows: List[Dict[str, float | str]] = field(default_factory=list)
+    failures: List[TaskFailure] = field(default_factory=list)
+
+
+def _downstream(
+    school: School,
+    *,
+    force: bool,
+    journal: RunJournal | None,
+    researched: bool,
+    score_cache: scoring.ScoreCache,
+) -> Dict[str, float | str] | None:
+    """Synthesise (when stale) and score one school; ``None`` if it has no evidence.
+
+    Evidence the journal already lists is only reused when no research task for
+    the school ran in this invocation; fresh raw facts always get resynthesised.
+    """
+
+    try:
+        if journal is not None and not researched and journal.is_done("evidence", school.slug):
+            LOGGER.info(
+                "Evidence already built in run %s for %s; skipping", journal.run_id, school.name
+            )
+        elif force or not synthesis.is_evidence_current(school):
+            evidence = synthesis.build_evidence_for_school(school)
+            if journal is not None:
+                journal.record("evidence", school.slug, output_hash=output_digest(evidence))
+        else:
+            LOGGER.info("Evidence up to date for %s; skipping", school.name)
+        with metrics.span("score_school"):
+            row = scoring.score_school(school, cache=score_cache)
+    except FileNotFoundError as exc:
+        LOGGER.warning(str(exc))
+        return None
+    LOGGER.info("Scored %s", school.name)
+    return row
+
+
+def run_pipeline(
+    schools: Sequence[School],
+    dimensions: Sequence[str],
+    *,
+    workers: int = 1,
+    evidence_workers: int = synthesis.DEFAULT_CONCURRENCY,
+    max_age: timedelta | None = None,
+    force: bool = False,
+    journal: RunJournal | None = None,
+) -> PipelineResult:
+    """Run every stage for every school as a per-school dependency chain.
+
+    Completed units are recorded in ``journal``; units it already lists as
+    complete (when resuming a run) are skipped.
+    """
+
+    result = PipelineResult()
+    tasks = raw_facts.plan_tasks(schools, dimensions, max_age)
+    if journal is not None:
+        remaining = [task for task in tasks if not journal.is_done("raw", task[0].slug, task[1])]
+        if len(remaining) < len(tasks):
+            LOGGER.info(
+                "Resuming run %s | skipping %s completed research tasks",
+                journal.run_id,
+                len(tasks) - len(remaining),
+            )
+        tasks = remaining
+    pending: Dict[str, int] = {}
+    for school, _ in tasks:
+        pending[school.slug] = pending.get(school.slug, 0) + 1
+
+    score_cache = scoring.ScoreCache.load()
+    downstream: Dict[Future, School] = {}
+    raw_pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    evidence_pool = ThreadPoolExecutor(max_workers=max(1, evidence_workers))
+    with raw_pool, evidence_pool:
+
+        def _release(school: School) -> None:
+            future = evidence_pool.submit(
+                _downstream,
+                school,
+                force=force,
+                journal=journal,
+                researched=school.slug in pending,
+                score_cache=score_cache,
+            )
+            downstream[future] = school
+
+        for school in schools:
+            if school.slug not in pending:
+                _release(school)
+
+        raw_futures = {
+            raw_pool.submit(raw_facts.run_task, school, dimension, journal=journal): (
+                school,
+                dimension,
+            )
+            for school, dimension in tasks
+        }
+        for done, future in enumerate(as_completed(raw_futures), start=1):
+            school, dimension = raw_futures[future]
+            failure = future.result()
+            if failure:
+                result.failures.append(failure)
+            LOGGER.info(
+                "Research %s/%s | school=%s | dimension=%s | %s",
+                done,
+                len(raw_futures),
+                school.name,
+                dimension,
+                "failed" if failure else "ok",
+            )
+            pending[school.slug] -= 1
+            if not pending[school.slug]:
+                _release(school)
+
+        for future in as_completed(list(downstream)):
+            school = downstream[future]
+            try:
+                row = future.result()
+            except Exception as exc:
+                LOGGER.exception("Evidence synthesis failed for %s", school.name)
+                metrics.incr("evidence.failures")
+                result.failures.append(
+                    TaskFailure(school=school.name, dimension="evidence", error=str(exc) or repr(exc))
+                )
+                continue
+            if row:
+                result.rows.append(row)
+
+    score_cache.save()
+    result.rows = scoring.write_scores_csv(result.rows)
+    if result.rows:
+        grid.update_scoring_grid()
+    if result.failures:
+        LOGGER.warning("Full run finished with %s failed tasks", len(result.failures))
+        for failure in result.failures:
+            LOGGER.warning("  %s / %s: %s", failure.school, failure.dimension, failure.error)
+    return result
+
+
+__all__ = ["PipelineResult", "run_pipeline"]
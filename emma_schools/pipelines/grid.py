@@ -7,6 +7,7 @@ import logging
 import re
 from typing import List
 
+from emma_schools.core import metrics
 from emma_schools.core.paths import data_csv, scoring_grid
 from emma_schools.core.slugs import to_slug
 from emma_schools.pipelines.scoring import DIMENSION_HEADERS, SECTION_TITLES
@@ -50,6 +51,7 @@ def _replace_grid(content: str, rows: List[str]) -> str:
     return pattern.sub(replacement, content)
 
 
+@metrics.timed("update_scoring_grid")
 def update_scoring_grid() -> None:
     csv_path = data_csv()
     if not csv_path.exists():
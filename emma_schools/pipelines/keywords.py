@@ -0,0 +1,93 @@
+"""Single-pass keyword matcher used to score evidence sections."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from emma_schools.config import REGISTRY, KeywordSet
+
+POLARITIES = ("positive", "negative")
+
+
+@dataclass(slots=True)
+class KeywordMatch:
+    term: str
+    polarity: str
+    start: int
+    end: int
+
+
+@dataclass(slots=True)
+class KeywordScan:
+    positives: int = 0
+    negatives: int = 0
+    matches: List[KeywordMatch] = field(default_factory=list)
+
+
+def _term_pattern(keyword: str) -> str:
+    if keyword.endswith("*"):
+        return re.escape(keyword[:-1]) + r"\w*"
+    return re.escape(keyword)
+
+
+class KeywordMatcher:
+    """Matches every keyword of every polarity in one scan of the text.
+
+    All keywords are compiled into a single alternation with one named group
+    per polarity, anchored on word boundaries so that e.g. ``top`` does not
+    fire inside ``stop`` or ``desktop``.
+    """
+
+    def __init__(self, lexicon: Dict[str, KeywordSet]) -> None:
+        self.weights = {polarity: lexicon[polarity].weight for polarity in POLARITIES}
+        groups = []
+        for polarity in POLARITIES:
+            # Longest first so a stem never shadows a longer literal.
+            terms = sorted(lexicon[polarity].keywords, key=len, reverse=True)
+            if terms:
+                alternation = "|".join(_term_pattern(term) for term in terms)
+                groups.append(f"(?P<{polarity}>{alternation})")
+        self._pattern = (
+            re.compile(rf"\b(?:{'|'.join(groups)})\b", flags=re.IGNORECASE) if groups else None
+        )
+
+    def scan(self, text: str) -> KeywordScan:
+        result = KeywordScan()
+        if self._pattern is None:
+            return result
+        for match in self._pattern.finditer(text):
+            polarity = match.lastgroup
+            if polarity == "positive":
+                result.positives += 1
+            else:
+                result.negatives += 1
+            result.matches.append(
+                KeywordMatch(
+                    term=match.group(0).lower(),
+                    polarity=polarity,
+                    start=match.start(),
+                    end=match.end(),
+                )
+            )
+        return result
+
+    def weighted(self, scan: KeywordScan) -> float:
+        return self.weights["positive"] * scan.positives - self.weights["negative"] * scan.negatives
+
+
+_default: Tuple[Dict[str, KeywordSet], KeywordMatcher] | None = None
+
+
+def default_matcher() -> KeywordMatcher:
+    """Matcher compiled from ``config/keywords.yml``, rebuilt only when the config reloads."""
+    global _default
+    lexicon = REGISTRY.keywords
+    cached = _default
+    if cached is None or cached[0] is not lexicon:
+        cached = _default = (lexicon, KeywordMatcher(lexicon))
+    return cached[1]
+
+
+__all__ = ["KeywordMatch", "KeywordScan", "KeywordMatcher", "default_matcher"]
@@ -0,0 +1,159 @@
+"""Re-weight and rank schools from the saved per-dimension score matrix.
+
+``score_all`` saves the section scores as ``data/scores.npy`` (one row per
+school, one column per entry of ``DIMENSION_HEADERS``) next to
+``data/scores-index.json``, which holds the row slugs and names and the column
+order. Ranking under a weight profile is then a single matrix-vector product,
+and a batch of profiles a single matrix-matrix product, without re-reading any
+evidence.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from emma_schools.core import metrics
+from emma_schools.core.files import atomic_write_bytes, atomic_write_text
+from emma_schools.core.paths import ensure_directories, score_index, score_matrix
+from emma_schools.pipelines.scoring import DIMENSION_HEADERS, WEIGHTS
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ScoreMatrix:
+    slugs: List[str]
+    names: List[str]
+    dimensions: List[str]
+    values: np.ndarray  # shape (schools, dimensions)
+
+
+@dataclass(slots=True)
+class Ranking:
+    weights: Dict[str, float]
+    overall: np.ndarray  # unrounded Overall per school, in matrix row order
+    order: np.ndarray  # row indices, best first (only the leaders when ranked with ``top``)
+
+
+def save_score_matrix(rows: Sequence[Mapping[str, float | str]]) -> None:
+    """Save the section scores of ``rows`` (as produced by ``score_school``)."""
+
+    ensure_directories()
+    values = np.array(
+        [[float(row[dimension]) for dimension in DIMENSION_HEADERS] for row in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), len(DIMENSION_HEADERS))
+    buffer = io.BytesIO()
+    np.save(buffer, values, allow_pickle=False)
+    index = {
+        "dimensions": DIMENSION_HEADERS,
+        "slugs": [str(row["Slug"]) for row in rows],
+        "names": [str(row["School"]) for row in rows],
+    }
+    # Index first: a reader that sees the new matrix also sees its index.
+    atomic_write_text(score_index(), json.dumps(index, indent=2) + "\n")
+    atomic_write_bytes(score_matrix(), buffer.getvalue())
+    LOGGER.info("Wrote %s (%s schools)", score_matrix(), len(rows))
+
+
+def load_score_matrix() -> ScoreMatrix:
+    matrix_path, index_path = score_matrix(), score_index()
+    if not matrix_path.exists() or not index_path.exists():
+        raise FileNotFoundError(f"No saved scores at {matrix_path}; run `emma score` first.")
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    values = np.load(matrix_path, allow_pickle=False)
+    if values.shape != (len(index["slugs"]), len(index["dimensions"])):
+        raise ValueError(f"{matrix_path} does not match {index_path}; run `emma score` again.")
+    return ScoreMatrix(index["slugs"], index["names"], index["dimensions"], values)
+
+
+def parse_weights(spec: str, dimensions: Sequence[str] = DIMENSION_HEADERS) -> Dict[str, float]:
+    """Parse ``academics=0.4,fit=0.3`` into weights keyed by dimension header.
+
+    Dimension names are case-insensitive; unlisted dimensions get weight 0.
+    """
+
+    lookup = {dimension.lower(): dimension for dimension in dimensions}
+    weights: Dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        dimension = lookup.get(name.strip().lower())
+        if not sep or dimension is None:
+            raise ValueError(f"Invalid weight {item.strip()!r} (use e.g. academics=0.4)")
+        try:
+            weight = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid weight {item.strip()!r} (use e.g. academics=0.4)") from None
+        if weight < 0:
+            raise ValueError(f"Weights must not be negative: {item.strip()!r}")
+        weights[dimension] = weight
+    if not any(weights.values()):
+        raise ValueError(f"Weight profile {spec!r} gives every dimension weight 0")
+    return weights
+
+
+def weight_matrix(profiles: Sequence[Mapping[str, float]], dimensions: Sequence[str]) -> np.ndarray:
+    """Stack profiles into a (dimensions, profiles) matrix, each column summing to 1.
+
+    Normalising keeps ``Overall`` on the same 1-5 scale as the section scores.
+    """
+
+    weights = np.array(
+        [[profile.get(dimension, 0.0) for profile in profiles] for dimension in dimensions],
+        dtype=np.float64,
+    ).reshape(len(dimensions), len(profiles))
+    return weights / weights.sum(axis=0)
+
+
+def _best_first(overall: np.ndarray, top: int | None) -> np.ndarray:
+    """Column indices per row of ``overall``, best first; only the first ``top`` when given."""
+
+    if top is not None and top < overall.shape[1]:
+        # Partition out the leaders, then sort just those: O(n) rather than O(n log n).
+        leaders = np.argpartition(-overall, top - 1, axis=1)[:, :top]
+        ranked = np.argsort(-np.take_along_axis(overall, leaders, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(leaders, ranked, axis=1)
+    # Stable sort so exact ties keep the saved (default-weight) order.
+    return np.argsort(-overall, axis=1, kind="stable")
+
+
+@metrics.timed("rank")
+def rank(
+    matrix: ScoreMatrix,
+    profiles: Sequence[Mapping[str, float]] | None = None,
+    *,
+    top: int | None = None,
+) -> List[Ranking]:
+    """Overall score and ordering of every school under each weight profile.
+
+    Without ``profiles`` the scoring ``WEIGHTS`` are used, which gives the CSV's
+    ``Overall`` column before rounding. With ``top`` only the leading schools
+    are ordered, which keeps large batches fast.
+    """
+
+    profiles = profiles or [WEIGHTS]
+    # (profiles, schools): each profile's scores are contiguous for the sort.
+    overall = weight_matrix(profiles, matrix.dimensions).T @ matrix.values.T
+    order = _best_first(overall, top)
+    return [
+        Ranking(dict(profile), overall[row], order[row]) for row, profile in enumerate(profiles)
+    ]
+
+
+__all__ = [
+    "Ranking",
+    "ScoreMatrix",
+    "load_score_matrix",
+    "parse_weights",
+    "rank",
+    "save_score_matrix",
+    "weight_matrix",
+]
@@ -0,0 +1,151 @@
+"""In-memory editing of a school's raw Markdown file.
+
+A ``RawDocument`` reads the file once, applies every marker edit to the text
+in memory and writes it back with a single atomic replace, so a crash can
+never leave a raw file half-updated.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from emma_schools.config import School
+from emma_schools.core.files import atomic_write_text
+from emma_schools.core.paths import raw_file
+
+LOGGER = logging.getLogger(__name__)
+
+SOURCE_START = "<!-- SOURCE-LOG:BEGIN -->"
+SOURCE_END = "<!-- SOURCE-LOG:END -->"
+FACT_START = "<!-- FACTS:BEGIN -->"
+FACT_END = "<!-- FACTS:END -->"
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def raw_template(school: School, dimensions: Sequence[str]) -> str:
+    categories = "\n".join(f"- {dimension}" for dimension in dimensions)
+    return f"""# {school.name} — Raw Facts
+
+## metadata
+- slug: {school.slug}
+- phase: {school.phase or 'n/a'}
+- created: {_timestamp()}
+
+## source-log
+{SOURCE_START}
+{SOURCE_END}
+
+## categories
+{categories}
+
+## quoted-excerpts
+<!-- QUOTES:BEGIN -->
+<!-- QUOTES:END -->
+
+## fact-records
+{FACT_START}
+{FACT_END}
+"""
+
+
+@dataclass(slots=True)
+class DimensionRun:
+    """One Deep Research result waiting to be written to a raw file."""
+
+    dimension: str
+    output: str
+    timestamp: str
+
+    @property
+    def block(self) -> str:
+        return f"### Dimension Run: {self.dimension} — {self.timestamp}\n\n{self.output.strip()}\n"
+
+
+class RawDocument:
+    """A raw file loaded into memory; edits are written by ``commit``."""
+
+    def __init__(self, path: Path, text: str, *, created: bool = False) -> None:
+        self.path = path
+        self.text = text
+        self.created = created
+        self._dirty = created
+
+    @classmethod
+    def open(cls, school: School, dimensions: Sequence[str]) -> "RawDocument":
+        """Load the school's raw file, or start from the template if it is missing."""
+
+        path = raw_file(school.slug)
+        if path.exists():
+            return cls(path, path.read_text(encoding="utf-8"))
+        return cls(path, raw_template(school, dimensions), created=True)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def _marker_match(self, start: str, end: str) -> re.Match[str]:
+        pattern = re.compile(rf"{re.escape(start)}(.*?){re.escape(end)}", flags=re.DOTALL)
+        match = pattern.search(self.text)
+        if not match:
+            raise ValueError(f"Markers {start} / {end} not found in {self.path}")
+        return match
+
+    def section(self, start: str, end: str) -> str:
+        """Return the text between two markers, or an empty string if they are absent."""
+
+        try:
+            return self._marker_match(start, end).group(1)
+        except ValueError:
+            return ""
+
+    def set_between(self, start: str, end: str, body: str) -> None:
+        match = self._marker_match(start, end)
+        body = body.strip()
+        replacement = f"{start}\n{body}\n{end}"
+        if match.group(0) == replacement:
+            return
+        self.text = self.text[: match.start()] + replacement + self.text[match.end() :]
+        self._dirty = True
+
+    def append_between(self, start: str, end: str, addition: str) -> None:
+        existing = self._marker_match(start, end).group(1).strip()
+        addition = addition.strip()
+        self.set_between(start, end, addition if not existing else f"{existing}\n\n{addition}")
+
+    def append_run(self, run: DimensionRun) -> None:
+        self.append_between(FACT_START, FACT_END, run.block)
+
+    def set_sources(self, sources: Iterable[str]) -> None:
+        self.set_between(SOURCE_START, SOURCE_END, "\n".join(f"- {source}" for source in sources))
+
+    def commit(self) -> bool:
+        """Write pending edits with one atomic replace; returns whether anything was written."""
+
+        if not self._dirty:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, self.text)
+        self._dirty = False
+        if self.created:
+            LOGGER.info("Created raw file %s", self.path.name)
+            self.created = False
+        return True
+
+
+__all__ = [
+    "SOURCE_START",
+    "SOURCE_END",
+    "FACT_START",
+    "FACT_END",
+    "DimensionRun",
+    "RawDocument",
+    "raw_template",
+]
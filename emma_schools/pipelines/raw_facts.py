@@ -3,20 +3,36 @@
 from __future__ import annotations
 
 import logging
-import re
-from datetime import datetime, timezone
-from typing import Iterable, Sequence
-
-from emma_schools.config import School, load_dimensions
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from emma_schools.config import REGISTRY, School
+from emma_schools.core import metrics
+from emma_schools.core.journal import RunJournal, output_digest
 from emma_schools.core.paths import ensure_directories, raw_file
 from emma_schools.deep_research import RAW_PROMPT_BUILDERS, run_deep_research
+from emma_schools.pipelines import fact_store
+from emma_schools.pipelines.raw_document import (
+    FACT_END,
+    FACT_START,
+    DimensionRun,
+    RawDocument,
+)
 
 LOGGER = logging.getLogger(__name__)
 
-SOURCE_START = "<!-- SOURCE-LOG:BEGIN -->"
-SOURCE_END = "<!-- SOURCE-LOG:END -->"
-FACT_START = "<!-- FACTS:BEGIN -->"
-FACT_END = "<!-- FACTS:END -->"
+_school_locks: Dict[str, threading.Lock] = {}
+_school_locks_guard = threading.Lock()
+
+
+@dataclass(slots=True)
+class TaskFailure:
+    school: str
+    dimension: str
+    error: str
 
 
 def _timestamp() -> str:
@@ -26,102 +42,106 @@ def _timestamp() -> str:
 def _default_dimensions(dimensions: Sequence[str] | None) -> list[str]:
     if dimensions:
         return [dimension.lower() for dimension in dimensions]
-    return load_dimensions()
+    return list(REGISTRY.dimensions)
 
 
-def _raw_template(school: School, dimensions: Sequence[str]) -> str:
-    categories = "\n".join(f"- {dimension}" for dimension in dimensions)
-    return f"""# {school.name} — Raw Facts
+def _school_lock(slug: str) -> threading.Lock:
+    """Return the lock guarding read-modify-write cycles on a school's raw file."""
+    with _school_locks_guard:
+        lock = _school_locks.get(slug)
+        if lock is None:
+            lock = threading.Lock()
+            _school_locks[slug] = lock
+        return lock
 
-## metadata
-- slug: {school.slug}
-- phase: {school.phase or 'n/a'}
-- created: {_timestamp()}
 
-## source-log
-{SOURCE_START}
-{SOURCE_END}
+def _load_fact_index(school: School, document: RawDocument) -> fact_store.FactIndex:
+    """Return the school's fact index, rebuilding it if it does not match the Markdown.
 
-## categories
-{categories}
+    Covers raw files that predate the index, hand edits to the Markdown and a
+    crash between the Markdown commit and the index write.
+    """
 
-## quoted-excerpts
-<!-- QUOTES:BEGIN -->
-<!-- QUOTES:END -->
+    section = document.section(FACT_START, FACT_END)
+    index = fact_store.read_index(school.slug)
+    if index is not None and index.facts_digest == fact_store.facts_digest(section):
+        return index
+    index = fact_store.build_index(section)
+    fact_store.write_index(school.slug, index)
+    LOGGER.info("Indexed %s fact records for %s", len(index.records), school.name)
+    return index
 
-## fact-records
-{FACT_START}
-{FACT_END}
-"""
 
+def _parse_stamp(value: str) -> datetime | None:
+    try:
+        stamp = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return stamp if stamp.tzinfo is not None else stamp.replace(tzinfo=timezone.utc)
 
-def _ensure_raw_file(school: School, dimensions: Sequence[str]) -> None:
-    ensure_directories()
-    path = raw_file(school.slug)
-    if path.exists():
-        return
-    path.write_text(_raw_template(school, dimensions), encoding="utf-8")
-    LOGGER.info("Created raw template for %s", school.name)
 
+def last_run_times(school: School) -> Dict[str, datetime]:
+    """Return the timestamp of the latest Dimension Run block per dimension.
 
-def _append_between_markers(path, start: str, end: str, addition: str) -> None:
-    text = path.read_text(encoding="utf-8")
-    pattern = re.compile(
-        rf"({re.escape(start)})(.*?)(\s*{re.escape(end)})",
-        flags=re.DOTALL,
-    )
-    match = pattern.search(text)
-    if not match:
-        raise ValueError(f"Markers {start} / {end} not found in {path}")
-
-    existing = match.group(2).strip()
-    addition = addition.strip()
-    combined = addition if not existing else f"{existing}\n\n{addition}"
-    replacement = f"{start}\n{combined}\n{end}"
-    updated = text[: match.start()] + replacement + text[match.end() :]
-    path.write_text(updated, encoding="utf-8")
-
-
-def _set_between_markers(path, start: str, end: str, new_body: str) -> None:
-    text = path.read_text(encoding="utf-8")
-    pattern = re.compile(
-        rf"{re.escape(start)}.*?{re.escape(end)}",
-        flags=re.DOTALL,
-    )
-    replacement = f"{start}\n{new_body.strip() if new_body.strip() else ''}\n{end}"
-    updated = pattern.sub(replacement, text, count=1)
-    path.write_text(updated, encoding="utf-8")
-
-
-def _extract_sources(text: str) -> list[str]:
-    sources = {
-        match.group(1).strip()
-        for match in re.finditer(r"-\s*Source:\s*(.+)", text)
-        if match.group(1).strip()
-    }
-    return sorted(sources)
+    Uses the run headers recorded in the fact index while its digest matches
+    the Markdown, and scans the Markdown otherwise.
+    """
 
-
-def _refresh_source_log(path) -> None:
-    text = path.read_text(encoding="utf-8")
-    sources = _extract_sources(text)
-    body = "\n".join(f"- {source}" for source in sources)
-    _set_between_markers(path, SOURCE_START, SOURCE_END, body)
+    path = raw_file(school.slug)
+    if not path.exists():
+        return {}
+    section = RawDocument(path, path.read_text(encoding="utf-8")).section(FACT_START, FACT_END)
+    header = fact_store.read_runs(school.slug)
+    if header is not None and header[0] == fact_store.facts_digest(section):
+        runs = header[1]
+    else:
+        runs = fact_store.parse_run_headers(section)
+    latest: Dict[str, datetime] = {}
+    for dimension, value in runs:
+        stamp = _parse_stamp(value)
+        if stamp is None:
+            continue
+        if dimension not in latest or stamp > latest[dimension]:
+            latest[dimension] = stamp
+    return latest
+
+
+def plan_tasks(
+    schools: Iterable[School],
+    dimensions: Sequence[str],
+    max_age: timedelta | None,
+) -> List[tuple[School, str]]:
+    """List the school/dimension pairs due for research, skipping fresh ones."""
+
+    if max_age is None:
+        return [(school, dimension) for school in schools for dimension in dimensions]
+    cutoff = datetime.now(timezone.utc) - max_age
+    tasks: List[tuple[School, str]] = []
+    skipped = 0
+    for school in schools:
+        latest = last_run_times(school)
+        for dimension in dimensions:
+            if dimension in latest and latest[dimension] >= cutoff:
+                skipped += 1
+                continue
+            tasks.append((school, dimension))
+    LOGGER.info("Freshness check | due=%s | fresh=%s | max_age=%s", len(tasks), skipped, max_age)
+    return tasks
 
 
-def run_for_school_dimension(
+def research_dimension(
     school: School,
     dimension: str,
     *,
     max_queries: int = 10,
     timeout: int = 600,
-) -> None:
+) -> DimensionRun:
+    """Run Deep Research for one dimension without touching the raw file."""
+
     dimension = dimension.lower()
     if dimension not in RAW_PROMPT_BUILDERS:
         raise ValueError(f"Unknown dimension: {dimension}")
 
-    dimensions = _default_dimensions(None)
-    _ensure_raw_file(school, dimensions)
     prompt_builder = RAW_PROMPT_BUILDERS[dimension]
     prompt = prompt_builder(school.name)
     topic = f"{school.name} — {dimension}"
@@ -134,30 +154,191 @@ def run_for_school_dimension(
         school_name=school.name,
         dimension=dimension,
     )
-    block = f"### Dimension Run: {dimension} — {_timestamp()}\n\n{output.strip()}\n"
-    path = raw_file(school.slug)
-    _append_between_markers(path, FACT_START, FACT_END, block)
-    _refresh_source_log(path)
-    LOGGER.info("Updated raw facts | school=%s | dimension=%s", school.name, dimension)
+    return DimensionRun(dimension=dimension, output=output, timestamp=_timestamp())
+
+
+def record_runs(school: School, runs: Sequence[DimensionRun]) -> None:
+    """Append ``runs`` to the school's raw file in one atomic commit.
+
+    The file is read once, every marker edit is applied in memory and the
+    result replaces the old file in a single ``os.replace``. The fact index is
+    rewritten after the Markdown commit with the digest of the new FACTS
+    section, so if the process dies in between the next run rebuilds it.
+    """
+
+    if not runs:
+        return
+    with _school_lock(school.slug), metrics.span("record_runs"):
+        ensure_directories()
+        document = RawDocument.open(school, REGISTRY.dimensions)
+        index = _load_fact_index(school, document)
+        for run in runs:
+            document.append_run(run)
+            index.records.extend(fact_store.parse_run_block(run.output, run.dimension, run.timestamp))
+            index.runs.append((run.dimension, run.timestamp))
+        document.set_sources(sorted({source for record in index.records for source in record.sources}))
+        document.commit()
+        index.facts_digest = fact_store.facts_digest(document.section(FACT_START, FACT_END))
+        fact_store.write_index(school.slug, index)
+    LOGGER.info(
+        "Updated raw facts | school=%s | dimensions=%s",
+        school.name,
+        ",".join(run.dimension for run in runs),
+    )
+
+
+def run_for_school_dimension(
+    school: School,
+    dimension: str,
+    *,
+    max_queries: int = 10,
+    timeout: int = 600,
+) -> str:
+    """Research one dimension for a school and append the result; returns the new block."""
+
+    run = research_dimension(school, dimension, max_queries=max_queries, timeout=timeout)
+    record_runs(school, [run])
+    return run.block
+
+
+def run_task(
+    school: School,
+    dimension: str,
+    *,
+    journal: RunJournal | None = None,
+) -> TaskFailure | None:
+    """Run one research task, returning its failure instead of raising.
+
+    Successful tasks are recorded in ``journal`` when one is given.
+    """
+    try:
+        block = run_for_school_dimension(school, dimension)
+        if journal is not None:
+            journal.record("raw", school.slug, dimension, output_hash=output_digest(block))
+    except Exception as exc:
+        # One failed task must not abort the rest of the batch.
+        metrics.incr("raw.failures")
+        LOGGER.exception("Raw research failed | school=%s | dimension=%s", school.name, dimension)
+        return TaskFailure(school=school.name, dimension=dimension, error=str(exc) or repr(exc))
+    return None
+
+
+def _log_failures(failures: Sequence[TaskFailure], total: int) -> None:
+    if not failures:
+        LOGGER.info("Raw research complete | tasks=%s | failures=0", total)
+        return
+    LOGGER.warning("Raw research complete | tasks=%s | failures=%s", total, len(failures))
+    for failure in failures:
+        LOGGER.warning("  %s / %s: %s", failure.school, failure.dimension, failure.error)
+
+
+def _execute(
+    tasks: Sequence[tuple[School, str]],
+    work: Callable[[School, str], TaskFailure | None],
+    workers: int,
+) -> List[TaskFailure]:
+    """Run ``work`` over ``tasks``, logging progress and collecting failures."""
+
+    total = len(tasks)
+    failures: List[TaskFailure] = []
+
+    def _progress(done: int, school: School, dimension: str, failure: TaskFailure | None) -> None:
+        LOGGER.info(
+            "Progress %s/%s | school=%s | dimension=%s | %s",
+            done,
+            total,
+            school.name,
+            dimension,
+            "failed" if failure else "ok",
+        )
+        if failure:
+            failures.append(failure)
+
+    if workers <= 1:
+        for done, (school, dimension) in enumerate(tasks, start=1):
+            _progress(done, school, dimension, work(school, dimension))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(work, school, dimension): (school, dimension)
+                for school, dimension in tasks
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                school, dimension = futures[future]
+                _progress(done, school, dimension, future.result())
+    return failures
 
 
 def run_for_school(
     school: School,
     dimensions: Sequence[str] | None = None,
-) -> None:
+    *,
+    workers: int = 1,
+    max_age: timedelta | None = None,
+) -> List[TaskFailure]:
+    """Research a school's dimensions and write every result in one commit.
+
+    The raw file is rewritten once for the whole school rather than once per
+    dimension.
+    """
+
     dims = _default_dimensions(dimensions)
-    for dimension in dims:
-        run_for_school_dimension(school, dimension)
+    tasks = plan_tasks([school], dims, max_age)
+    runs: Dict[str, DimensionRun] = {}
+
+    def _research(school: School, dimension: str) -> TaskFailure | None:
+        try:
+            runs[dimension] = research_dimension(school, dimension)
+        except Exception as exc:
+            LOGGER.exception("Raw research failed | school=%s | dimension=%s", school.name, dimension)
+            metrics.incr("raw.failures")
+            return TaskFailure(school=school.name, dimension=dimension, error=str(exc) or repr(exc))
+        return None
+
+    failures = _execute(tasks, _research, workers)
+    # Keep the planned dimension order regardless of completion order.
+    ordered = [runs[dimension] for _, dimension in tasks if dimension in runs]
+    try:
+        record_runs(school, ordered)
+    except Exception as exc:
+        LOGGER.exception("Writing raw facts failed | school=%s", school.name)
+        failures.extend(
+            TaskFailure(school=school.name, dimension=run.dimension, error=str(exc) or repr(exc))
+            for run in ordered
+        )
+    _log_failures(failures, len(tasks))
+    return failures
 
 
 def run_for_all(
     schools: Iterable[School],
     dimensions: Sequence[str] | None = None,
-) -> None:
-    dims = _default_dimensions(dimensions)
-    for school in schools:
-        for dimension in dims:
-            run_for_school_dimension(school, dimension)
+    *,
+    workers: int = 1,
+    max_age: timedelta | None = None,
+) -> List[TaskFailure]:
+    """Research every school/dimension pair, optionally on ``workers`` threads.
 
+    With ``max_age`` only pairs whose latest Dimension Run block is older than
+    that (or missing) are researched. Failures are collected and reported once
+    the whole batch has finished.
+    """
 
-__all__ = ["run_for_school_dimension", "run_for_school", "run_for_all"]
+    dims = _default_dimensions(dimensions)
+    tasks = plan_tasks(schools, dims, max_age)
+    failures = _execute(tasks, run_task, workers)
+    _log_failures(failures, len(tasks))
+    return failures
+
+
+__all__ = [
+    "TaskFailure",
+    "last_run_times",
+    "plan_tasks",
+    "research_dimension",
+    "record_runs",
+    "run_task",
+    "run_for_school_dimension",
+    "run_for_school",
+    "run_for_all",
+]
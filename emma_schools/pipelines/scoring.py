@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
 import logging
-import re
-from pathlib import Path
-from typing import Dict, Iterable, List
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
 
-from emma_schools.config import School
-from emma_schools.core.paths import data_csv, evidence_file, ensure_directories
+from emma_schools.config import School, loaders
+from emma_schools.core import metrics
+from emma_schools.core.files import atomic_write_text
+from emma_schools.core.paths import data_csv, evidence_file, ensure_directories, score_cache
+from emma_schools.pipelines.keywords import default_matcher
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,38 +48,121 @@ WEIGHTS = {
     "Fit": 0.20,
 }
 
-POSITIVE_KEYWORDS = [
-    "excellent",
-    "strong",
-    "outstanding",
-    "award",
-    "scholar",
-    "improved",
-    "improving",
-    "leading",
-    "top",
-    "high",
-    "notable",
-]
+# Bump when the section scoring itself changes so cached scores are discarded.
+SCORE_CACHE_VERSION = 1
 
-NEGATIVE_KEYWORDS = [
-    "concern",
-    "weak",
-    "decline",
-    "issue",
-    "warning",
-    "limited",
-    "below",
-    "poor",
-    "criticism",
-    "challenge",
-]
+Row = Dict[str, float | str]
+Stamp = Tuple[int, int]
+
+
+@dataclass(slots=True)
+class ParsedEvidence:
+    name: str
+    sections: Dict[str, str]
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split an evidence file into its ``## <title>`` sections in one pass.
+
+    Titles are lower-cased; if a title repeats, the first section wins.
+    """
+
+    sections: Dict[str, str] = {}
+    title: str | None = None
+    body: List[str] = []
+
+    def _flush() -> None:
+        if title is not None and title not in sections:
+            sections[title] = "\n".join(body).strip()
+
+    for line in text.splitlines():
+        if line.startswith("## "):
+            _flush()
+            title = line[3:].strip().lower()
+            body = []
+        elif title is not None:
+            body.append(line)
+    _flush()
+    return sections
 
 
-def _extract_section(text: str, section: str) -> str:
-    pattern = rf"##\s+{re.escape(section)}\s*(.*?)(?=\n## |\Z)"
-    match = re.search(pattern, text, flags=re.IGNORECASE | re.DOTALL)
-    return match.group(1).strip() if match else ""
+def _parse_evidence(text: str) -> ParsedEvidence:
+    return ParsedEvidence(name=_parse_school_name(text), sections=split_sections(text))
+
+
+def _evidence_stamp(school: School) -> Stamp | None:
+    try:
+        stat = evidence_file(school.slug).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _scoring_fingerprint() -> str:
+    """Identify everything besides the evidence text that a score depends on."""
+
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps([SCORE_CACHE_VERSION, DIMENSION_HEADERS, SECTION_TITLES, WEIGHTS]).encode()
+    )
+    try:
+        digest.update((loaders.CONFIG_DIR / "keywords.yml").read_bytes())
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+class ScoreCache:
+    """Scores from earlier runs, kept in ``data/evidence-scores.json``.
+
+    An entry is reused while its evidence file's mtime and size are unchanged,
+    so unchanged files are neither re-read nor re-scored. The whole cache is
+    dropped when the keyword config, the dimension layout or
+    ``SCORE_CACHE_VERSION`` changes.
+    """
+
+    def __init__(self, fingerprint: str, entries: Dict[str, dict] | None = None) -> None:
+        self.fingerprint = fingerprint
+        self.entries = entries or {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "ScoreCache":
+        fingerprint = _scoring_fingerprint()
+        try:
+            data = json.loads(score_cache().read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(fingerprint)
+        if data.get("fingerprint") != fingerprint:
+            LOGGER.info("Scoring inputs changed; rescoring every evidence file")
+            return cls(fingerprint)
+        return cls(fingerprint, data.get("entries", {}))
+
+    def lookup(self, slug: str, stamp: Stamp | None) -> Row | None:
+        with self._lock:
+            entry = self.entries.get(slug)
+            if stamp is not None and entry is not None and tuple(entry["stamp"]) == stamp:
+                self.hits += 1
+                return dict(entry["row"])
+            self.misses += 1
+        return None
+
+    def store(self, slug: str, stamp: Stamp | None, row: Row) -> None:
+        if stamp is None:
+            return
+        with self._lock:
+            self.entries[slug] = {"stamp": list(stamp), "row": row}
+
+    def save(self) -> None:
+        ensure_directories()
+        with self._lock:
+            payload = {"fingerprint": self.fingerprint, "entries": self.entries}
+            atomic_write_text(score_cache(), json.dumps(payload) + "\n")
+        metrics.incr("cache.scores.hits", self.hits)
+        metrics.incr("cache.scores.misses", self.misses)
+        LOGGER.info("Score cache | reused=%s | scored=%s", self.hits, self.misses)
 
 
 def _score_section(text: str) -> float:
@@ -82,10 +170,8 @@ def _score_section(text: str) -> float:
         return 1.0
     bullets = [line.strip() for line in text.splitlines() if line.strip().startswith("-")]
     detail_bonus = min(0.5, 0.05 * len(bullets))
-    lower = text.lower()
-    positives = sum(lower.count(keyword) for keyword in POSITIVE_KEYWORDS)
-    negatives = sum(lower.count(keyword) for keyword in NEGATIVE_KEYWORDS)
-    score = 3.0 + 0.25 * positives - 0.25 * negatives + detail_bonus
+    matcher = default_matcher()
+    score = 3.0 + matcher.weighted(matcher.scan(text)) + detail_bonus
     return max(1.0, min(5.0, score))
 
 
@@ -98,43 +184,107 @@ def _parse_school_name(text: str) -> str:
     return "Unknown School"
 
 
-def score_school(school: School) -> Dict[str, float | str]:
+def score_school(school: School, *, cache: ScoreCache | None = None) -> Row:
+    """Score one school's evidence file, reusing ``cache`` while the file is unchanged."""
+
     path = evidence_file(school.slug)
-    if not path.exists():
+    stamp = _evidence_stamp(school)
+    if stamp is None:
         raise FileNotFoundError(f"Evidence file missing for {school.name}: {path}")
+    if cache is not None:
+        cached = cache.lookup(school.slug, stamp)
+        if cached is not None:
+            return cached
 
-    text = path.read_text(encoding="utf-8")
-    name = _parse_school_name(text)
+    parsed = _parse_evidence(path.read_text(encoding="utf-8"))
+    name = parsed.name
     section_scores = {
-        dimension: _score_section(_extract_section(text, SECTION_TITLES[dimension]))
+        dimension: _score_section(parsed.sections.get(SECTION_TITLES[dimension], ""))
         for dimension in DIMENSION_HEADERS
     }
 
     overall = sum(section_scores[dim] * WEIGHTS[dim] for dim in DIMENSION_HEADERS)
 
-    return {
+    row: Row = {
         "School": name or school.name,
         "Slug": school.slug,
         **section_scores,
         "Overall": round(overall, 2),
     }
+    if cache is not None:
+        cache.store(school.slug, stamp, row)
+    return row
 
 
-def score_all(schools: Iterable[School]) -> List[Dict[str, float | str]]:
+def _try_score_school(school: School) -> Row | str:
+    """Score a school, returning the missing-file message instead of raising."""
+    try:
+        return score_school(school)
+    except FileNotFoundError as exc:
+        return str(exc)
+
+
+@metrics.timed("score_all")
+def score_all(
+    schools: Iterable[School],
+    *,
+    workers: int = 1,
+) -> List[Row]:
+    """Score every school and write the CSV; ``workers > 1`` scores on a process pool.
+
+    Schools whose evidence file is unchanged since the last run reuse their
+    cached scores (see ``ScoreCache``); only the rest are scored.
+    """
+
     ensure_directories()
-    rows: List[Dict[str, float | str]] = []
-    for school in schools:
-        try:
-            score_row = score_school(school)
-            rows.append(score_row)
-            LOGGER.info("Scored %s", school.name)
-        except FileNotFoundError as exc:
-            LOGGER.warning(str(exc))
+    school_list = list(schools)
+    cache = ScoreCache.load()
+    # Stamp before scoring: a file edited meanwhile is rescored next time.
+    stamps = {school.slug: _evidence_stamp(school) for school in school_list}
+    results: Dict[str, Row | str] = {}
+    todo: List[School] = []
+    for school in school_list:
+        cached = cache.lookup(school.slug, stamps[school.slug])
+        if cached is None:
+            todo.append(school)
+        else:
+            results[school.slug] = cached
+
+    if workers > 1 and len(todo) > 1:
+        # Imported here: multiprocessing adds noticeably to the CLI's startup.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scored = list(pool.map(_try_score_school, todo, chunksize=16))
+    else:
+        scored = [_try_score_school(school) for school in todo]
+    for school, result in zip(todo, scored):
+        results[school.slug] = result
+        if not isinstance(result, str):
+            cache.store(school.slug, stamps[school.slug], result)
+    cache.save()
+
+    rows: List[Row] = []
+    for school in school_list:
+        result = results[school.slug]
+        if isinstance(result, str):
+            LOGGER.warning(result)
+            metrics.incr("score.failures")
+            continue
+        rows.append(result)
+        LOGGER.info("Scored %s", school.name)
+
+    return write_scores_csv(rows)
+
+
+def write_scores_csv(rows: List[Row]) -> List[Row]:
+    """Sort score rows by Overall, write the CSV and the score matrix; returns the sorted rows."""
 
     if not rows:
         LOGGER.warning("No evidence files found; skipping CSV generation.")
         return rows
 
+    ensure_directories()
     rows.sort(key=lambda row: row["Overall"], reverse=True)
     header = ["School", "Overall", *DIMENSION_HEADERS]
     csv_path = data_csv()
@@ -145,7 +295,21 @@ def score_all(schools: Iterable[School]) -> List[Dict[str, float | str]]:
             writer.writerow({key: row.get(key, "") for key in header})
 
     LOGGER.info("Wrote %s", csv_path)
+
+    # Imported here so numpy is only loaded once there are scores to save.
+    from emma_schools.pipelines.ranking import save_score_matrix
+
+    save_score_matrix(rows)
     return rows
 
 
-__all__ = ["score_school", "score_all", "DIMENSION_HEADERS", "SECTION_TITLES"]
+__all__ = [
+    "ScoreCache",
+    "score_school",
+    "score_all",
+    "write_scores_csv",
+    "split_sections",
+    "DIMENSION_HEADERS",
+    "SECTION_TITLES",
+    "WEIGHTS",
+]
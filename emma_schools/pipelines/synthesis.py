@@ -2,12 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Iterable
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
 
 from emma_schools.config import School
-from emma_schools.core.paths import evidence_file, raw_file
-from emma_schools.deep_research import evidence_prompt, run_chat_completion
+from emma_schools.core import metrics
+from emma_schools.core.paths import (
+    batch_dir,
+    ensure_directories,
+    evidence_file,
+    evidence_manifest,
+    raw_file,
+)
+from emma_schools.core.files import atomic_write_text
+from emma_schools.deep_research import (
+    EVIDENCE_PROMPT_VERSION,
+    evidence_prompt,
+    resolve_chat_model,
+    run_chat_completion,
+    run_chat_completion_async,
+)
+from emma_schools.deep_research.batch import (
+    BatchNotFound,
+    build_request_line,
+    collect_results,
+    submit_batch,
+    wait_for_batch,
+    write_batch_file,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +50,16 @@ EVIDENCE_SECTIONS = [
     "fit",
 ]
 
+DEFAULT_CONCURRENCY = 4
+
+_manifest_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class EvidenceFailure:
+    school: str
+    error: str
+
 
 def _normalize_output(school_name: str, text: str) -> str:
     text = text.strip()
@@ -33,16 +72,62 @@ def _normalize_output(school_name: str, text: str) -> str:
     return text.strip() + "\n"
 
 
-def build_evidence_for_school(
+def _load_manifest() -> Dict[str, dict]:
+    path = evidence_manifest()
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _record_manifest(school: School, raw_digest: str, model: str | None) -> None:
+    with _manifest_lock:
+        manifest = _load_manifest()
+        manifest[school.slug] = {
+            "raw_sha256": raw_digest,
+            "prompt_version": EVIDENCE_PROMPT_VERSION,
+            "model": resolve_chat_model(model),
+            "updated": datetime.now(timezone.utc).isoformat(),
+        }
+        ensure_directories()
+        atomic_write_text(evidence_manifest(), json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def _raw_digest(school: School) -> str | None:
+    raw_path = raw_file(school.slug)
+    if not raw_path.exists():
+        return None
+    return hashlib.sha256(raw_path.read_bytes()).hexdigest()
+
+
+def is_evidence_current(
     school: School,
     *,
     model: str | None = None,
-) -> str:
+    manifest: Dict[str, dict] | None = None,
+) -> bool:
+    """True when the evidence file was built from the current raw file, prompt and model."""
+
+    if not evidence_file(school.slug).exists():
+        return False
+    entry = (manifest if manifest is not None else _load_manifest()).get(school.slug)
+    if not entry:
+        return False
+    return (
+        entry.get("raw_sha256") == _raw_digest(school)
+        and entry.get("prompt_version") == EVIDENCE_PROMPT_VERSION
+        and entry.get("model") == resolve_chat_model(model)
+    )
+
+
+def _evidence_request(school: School) -> Tuple[List[dict], str]:
+    """Build the synthesis messages and the digest of the raw text they embed."""
+
     raw_path = raw_file(school.slug)
     if not raw_path.exists():
         raise FileNotFoundError(f"Raw file missing for {school.name}: {raw_path}")
 
-    prompt = evidence_prompt(school.name, raw_path.read_text(encoding="utf-8"))
+    raw_bytes = raw_path.read_bytes()
+    prompt = evidence_prompt(school.name, raw_bytes.decode("utf-8"))
     messages = [
         {
             "role": "system",
@@ -50,25 +135,223 @@ def build_evidence_for_school(
         },
         {"role": "user", "content": prompt},
     ]
-    LOGGER.info("Building evidence for %s", school.name)
-    output = run_chat_completion(messages, model=model)
+    return messages, hashlib.sha256(raw_bytes).hexdigest()
+
+
+def _write_evidence(school: School, output: str, raw_digest: str, model: str | None) -> str:
     normalized = _normalize_output(school.name, output)
     path = evidence_file(school.slug)
-    path.write_text(normalized, encoding="utf-8")
+    atomic_write_text(path, normalized)
+    _record_manifest(school, raw_digest, model)
     LOGGER.info("Wrote evidence file %s", path)
     return normalized
 
 
+def _partial_evidence_file(school: School) -> Path:
+    path = evidence_file(school.slug)
+    return path.with_name(f"{path.name}.partial")
+
+
+def build_evidence_for_school(
+    school: School,
+    *,
+    model: str | None = None,
+    stream: bool = False,
+) -> str:
+    messages, raw_digest = _evidence_request(school)
+    LOGGER.info("Building evidence for %s", school.name)
+    output = run_chat_completion(
+        messages,
+        model=model,
+        stream=stream,
+        partial_path=_partial_evidence_file(school) if stream else None,
+    )
+    return _write_evidence(school, output, raw_digest, model)
+
+
+async def build_evidence_for_school_async(
+    school: School,
+    *,
+    model: str | None = None,
+) -> str:
+    messages, raw_digest = _evidence_request(school)
+    LOGGER.info("Building evidence for %s", school.name)
+    output = await run_chat_completion_async(messages, model=model)
+    return _write_evidence(school, output, raw_digest, model)
+
+
+def _failure(school: School, exc: Exception) -> EvidenceFailure | None:
+    """Log a failed build; a missing raw file is only a warning, not a failure."""
+
+    if isinstance(exc, FileNotFoundError):
+        LOGGER.warning(str(exc))
+        return None
+    LOGGER.error("Evidence synthesis failed for %s", school.name, exc_info=exc)
+    metrics.incr("evidence.failures")
+    return EvidenceFailure(school=school.name, error=str(exc) or repr(exc))
+
+
+async def _build_evidence_concurrently(
+    schools: Iterable[School],
+    *,
+    model: str | None,
+    concurrency: int,
+) -> List[EvidenceFailure]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _build(school: School) -> EvidenceFailure | None:
+        async with semaphore:
+            try:
+                await build_evidence_for_school_async(school, model=model)
+            except Exception as exc:
+                return _failure(school, exc)
+            return None
+
+    results = await asyncio.gather(*(_build(school) for school in schools))
+    return [failure for failure in results if failure is not None]
+
+
+def _stale_schools(schools: Iterable[School], model: str | None) -> List[School]:
+    manifest = _load_manifest()
+    stale: List[School] = []
+    for school in schools:
+        if is_evidence_current(school, model=model, manifest=manifest):
+            LOGGER.info("Evidence up to date for %s; skipping", school.name)
+            continue
+        stale.append(school)
+    return stale
+
+
 def build_evidence_for_all(
     schools: Iterable[School],
     *,
     model: str | None = None,
-) -> None:
-    for school in schools:
+    concurrency: int = DEFAULT_CONCURRENCY,
+    force: bool = False,
+) -> List[EvidenceFailure]:
+    """Build evidence for every school, up to ``concurrency`` model calls at a time.
+
+    Schools whose raw file, prompt version and model match the manifest entry
+    for their existing evidence file are skipped unless ``force`` is set. A
+    failed school does not stop the others; the failures are returned.
+    """
+
+    targets = list(schools) if force else _stale_schools(schools, model)
+    if concurrency > 1:
+        failures = asyncio.run(
+            _build_evidence_concurrently(targets, model=model, concurrency=concurrency)
+        )
+    else:
+        failures = []
+        for school in targets:
+            try:
+                build_evidence_for_school(school, model=model)
+            except Exception as exc:
+                failure = _failure(school, exc)
+                if failure is not None:
+                    failures.append(failure)
+
+    if failures:
+        LOGGER.warning("Evidence synthesis | schools=%s | failures=%s", len(targets), len(failures))
+        for failure in failures:
+            LOGGER.warning("  %s: %s", failure.school, failure.error)
+    return failures
+
+
+def _batch_state_path():
+    return batch_dir() / "evidence-state.json"
+
+
+def _submit_evidence_batch(targets: Iterable[School], model: str | None) -> dict | None:
+    lines = []
+    digests: Dict[str, str] = {}
+    for school in targets:
         try:
-            build_evidence_for_school(school, model=model)
+            messages, digest = _evidence_request(school)
         except FileNotFoundError as exc:
             LOGGER.warning(str(exc))
+            continue
+        lines.append(build_request_line(school.slug, messages, model=model))
+        digests[school.slug] = digest
+    if not lines:
+        return None
 
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    request_path = batch_dir() / f"evidence-{stamp}.jsonl"
+    write_batch_file(request_path, lines)
+    batch_id = submit_batch(request_path, metadata={"job": "evidence"})
+    state = {"batch_id": batch_id, "model": model, "requests": digests}
+    atomic_write_text(_batch_state_path(), json.dumps(state, indent=2) + "\n")
+    return state
 
-__all__ = ["build_evidence_for_school", "build_evidence_for_all", "EVIDENCE_SECTIONS"]
+
+def build_evidence_batch(
+    schools: Iterable[School],
+    *,
+    model: str | None = None,
+    force: bool = False,
+    poll_interval: float = 30.0,
+) -> Dict[str, str]:
+    """Synthesise evidence for many schools in a single OpenAI Batch job.
+
+    The submitted batch is recorded in ``data/batches/evidence-state.json``.
+    If the process stops while waiting, the next call resumes polling that
+    batch instead of submitting a new one; a recorded batch the API no longer
+    knows is discarded and the stale schools are resubmitted. Schools whose
+    request failed keep a stale manifest entry, so the next call resubmits
+    only those. Returns the error message per failed slug.
+    """
+
+    school_list = list(schools)
+    state_path = _batch_state_path()
+    batch = None
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else None
+    if state is not None:
+        LOGGER.info("Resuming evidence batch %s", state["batch_id"])
+        try:
+            batch = wait_for_batch(state["batch_id"], poll_interval=poll_interval)
+        except BatchNotFound:
+            LOGGER.warning(
+                "Evidence batch %s no longer exists; discarding %s and resubmitting",
+                state["batch_id"],
+                state_path,
+            )
+            state_path.unlink()
+            state = None
+    if state is None:
+        targets = school_list if force else _stale_schools(school_list, model)
+        state = _submit_evidence_batch(targets, model)
+        if state is None:
+            LOGGER.info("No evidence files need rebuilding")
+            return {}
+        batch = wait_for_batch(state["batch_id"], poll_interval=poll_interval)
+
+    results = collect_results(batch)
+    by_slug = {school.slug: school for school in school_list}
+    errors: Dict[str, str] = {}
+    for slug, digest in state["requests"].items():
+        school = by_slug.get(slug)
+        if school is None:
+            continue
+        if slug in results.outputs:
+            _write_evidence(school, results.outputs[slug], digest, state["model"])
+        else:
+            errors[slug] = results.errors.get(slug, f"no result (batch {batch.status})")
+
+    state_path.unlink()
+    if errors:
+        LOGGER.warning("Evidence batch %s | failed=%s; rerun to resubmit them", batch.id, len(errors))
+        for slug, error in errors.items():
+            LOGGER.warning("  %s: %s", slug, error)
+    return errors
+
+
+__all__ = [
+    "build_evidence_batch",
+    "build_evidence_for_school",
+    "build_evidence_for_school_async",
+    "build_evidence_for_all",
+    "EvidenceFailure",
+    "is_evidence_current",
+    "EVIDENCE_SECTIONS",
+]
@@ -0,0 +1,32 @@
+"""Size accounting and eviction in ``DiskCache``."""
+
+from __future__ import annotations
+
+from emma_schools.core.cache import DiskCache
+
+
+def _stored(cache: DiskCache) -> int:
+    return cache._stored_bytes(cache._connection())
+
+
+def test_running_total_matches_the_table(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=10**6)
+    for index in range(50):
+        cache.set(f"key-{index}", {"text": "x" * index})
+    cache.set("key-10", {"text": "replaced"})
+    cache.delete("key-20")
+    cache.delete("missing")
+
+    assert cache._total == _stored(cache)
+    assert DiskCache(tmp_path / "cache.sqlite", max_bytes=10**6)._connection() is not None
+
+
+def test_eviction_keeps_recent_entries_within_budget(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=5_000)
+    for index in range(200):
+        cache.set(f"key-{index}", {"text": "x" * 90})
+
+    assert _stored(cache) <= 5_000
+    assert cache._total == _stored(cache)
+    assert cache.get("key-199") is not None
+    assert cache.get("key-0") is None
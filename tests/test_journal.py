@@ -0,0 +1,40 @@
+"""Resuming a run journal after a crash."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from emma_schools.core import paths
+from emma_schools.core.journal import RunJournal
+
+
+@pytest.fixture(autouse=True)
+def project_root(tmp_path):
+    previous = paths.set_project_root(tmp_path)
+    yield tmp_path
+    paths.set_project_root(previous)
+
+
+def test_torn_tail_is_dropped_before_the_next_record():
+    journal = RunJournal.create()
+    journal.record("raw", "school-a", "academics")
+    with journal.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"stage": "raw", "school": "school-a", "dimen')  # crash mid-write
+
+    resumed = RunJournal.open(journal.run_id)
+    assert resumed.is_done("raw", "school-a", "academics")
+    assert len(resumed) == 1
+    resumed.record("evidence", "school-a")
+
+    lines = journal.path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["stage"] for line in lines] == ["raw", "evidence"]
+    again = RunJournal.open(journal.run_id)
+    assert again.is_done("evidence", "school-a")
+    assert len(again) == 2
+
+
+def test_missing_journal_raises():
+    with pytest.raises(FileNotFoundError):
+        RunJournal.open("20260101T000000Z-000000")
@@ -0,0 +1,71 @@
+"""Per-host fetch scheduling in ``gather_sources``."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from emma_schools.deep_research import search
+
+SLOW_SECONDS = 0.2
+
+
+@pytest.fixture
+def fake_web(monkeypatch):
+    """Search results on a slow and a fast host; records when each fetch finished."""
+
+    finished = {}
+    lock = threading.Lock()
+
+    def ddg_search(query, max_results=4):
+        host = "slow.example" if query == "slow" else "fast.example"
+        return [{"href": f"https://{host}/{i}", "title": "t", "body": "b"} for i in range(max_results)]
+
+    def fetch_url_text(url, *, timeout=12, max_chars=4000):
+        if "slow.example" in url:
+            time.sleep(SLOW_SECONDS)
+        with lock:
+            finished[url] = time.monotonic()
+        return f"text of {url}"
+
+    monkeypatch.setattr(search, "ddg_search", ddg_search)
+    monkeypatch.setattr(search, "fetch_url_text", fetch_url_text)
+    monkeypatch.setattr(search.PAGE_CACHE, "enabled", False)
+    return finished
+
+
+def test_slow_host_does_not_delay_other_hosts(fake_web):
+    # More queued slow-host fetches than pool threads, submitted ahead of the fast ones.
+    slow_count = search.FETCH_MAX_WORKERS + 4
+    started = time.monotonic()
+    sources = search.gather_sources(
+        ["slow", "fast"], per_query=slow_count, total_limit=100, max_workers=8
+    )
+
+    assert len(sources) == 2 * slow_count
+    fast = [at - started for url, at in fake_web.items() if "fast.example" in url]
+    assert len(fast) == slow_count
+    assert max(fast) < SLOW_SECONDS / 2
+
+
+def test_fetches_per_host_stay_capped(monkeypatch, fake_web):
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    slow_fetch = search.fetch_url_text
+
+    def counting_fetch(url, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        try:
+            return slow_fetch(url, **kwargs)
+        finally:
+            with lock:
+                active["now"] -= 1
+
+    monkeypatch.setattr(search, "fetch_url_text", counting_fetch)
+    search.gather_sources(["slow"], per_query=6, total_limit=100, max_workers=8)
+
+    assert active["max"] == search.FETCH_PER_DOMAIN
@@ -0,0 +1,31 @@
+"""Import-time budget of the local CLI commands, run for real in a temporary project tree."""
+
+from __future__ import annotations
+
+import pytest
+
+from emma_schools.cli.startup_budget import DEFAULT_BUDGET_MS, measure, seed_project
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    seed_project(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("command", ["grid", "score"])
+def test_local_command_imports_stay_light(project_root, command):
+    report = measure(command, project_root)
+
+    assert report.heavy == []
+    assert 0 < report.package_ms <= DEFAULT_BUDGET_MS
+
+
+def test_commands_write_to_the_given_root(project_root):
+    measure("grid", project_root)
+    measure("score", project_root)
+
+    assert (project_root / "data" / "metrics").is_dir()
+    assert "<!-- GRID:BEGIN -->" in (project_root / "docs" / "synthesis" / "scoring-grid.md").read_text(
+        encoding="utf-8"
+    )